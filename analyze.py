@@ -11,16 +11,29 @@ Usage:
 
 import argparse
 import asyncio
+import hashlib
+import mmap
 import os
+import random
+import re
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
 
 import anthropic
 
 from llm_providers import CodexExecRunner, add_codex_arguments, resolve_codex_model
 
 SECTION_SEP = "-" * 36
+# The separator line between sections, delimited by \n, \r\n or \r
+SECTION_SEP_RE = re.compile(rb"(?:\r\n?|\n)" + SECTION_SEP.encode() + rb"(?:\r\n?|\n)")
+SUMMARIES_VERSION_RE = re.compile(r"summaries_v([1-9]\d*)\.md")
+CHARS_PER_TOKEN = 4  # rough estimate
+DEFAULT_BATCH_TOKENS = 80_000  # input token budget per request, prompt included
+DEFAULT_CACHE_TTL_HOURS = 24
+MAX_RETRY_WAIT = 300
 
 CODEX_ANALYSIS_SYSTEM_PROMPT = (
     "You are running a batch analysis step in a YouTube summary processing pipeline. "
@@ -31,25 +44,55 @@ CODEX_ANALYSIS_SYSTEM_PROMPT = (
 
 
 def find_latest_summaries(input_dir: Path) -> Path:
-    """Find the highest-versioned summaries file, falling back to summaries.md."""
-    base = input_dir / "summaries.md"
-    latest = base
-    version = 2
-    while (candidate := input_dir / f"summaries_v{version}.md").exists():
-        latest = candidate
-        version += 1
-    if not latest.exists():
-        return base  # let caller handle the missing-file error
+    """Find the highest-versioned summaries file, falling back to summaries.md.
+
+    The directory is listed once rather than probing each version in turn.
+    """
+    latest = input_dir / "summaries.md"  # caller handles a missing file
+    version = 1
+    try:
+        with os.scandir(input_dir) as it:
+            for entry in it:
+                m = SUMMARIES_VERSION_RE.fullmatch(entry.name)
+                if m and int(m.group(1)) > version and entry.is_file():
+                    version = int(m.group(1))
+                    latest = Path(entry.path)
+    except OSError:
+        pass
     return latest
 
 
-def parse_sections(text: str) -> list[str]:
-    """Split summaries.md on section separator, dropping empty sections."""
-    parts = text.split("\n" + SECTION_SEP + "\n")
-    return [s.strip() for s in parts if s.strip()]
-
-
-def extract_titles(sections: list[str]) -> str:
+def iter_sections(path: Path) -> Iterator[str]:
+    """Yield sections of a summaries file one at a time, dropping empty ones.
+
+    The file is memory-mapped and split on the separator at the byte level,
+    like split.py and prune.py; only each section's slice is decoded, right
+    before it is yielded.  Any newline convention delimits a separator and
+    is normalised to "\\n" in the yielded text, as a text-mode read would.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            for m in SECTION_SEP_RE.finditer(mm):
+                section = decode_section(mm[start:m.start()])
+                if section:
+                    yield section
+                start = m.end()
+            section = decode_section(mm[start:])
+            if section:
+                yield section
+
+
+def decode_section(raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.strip()
+
+
+def extract_titles(sections: Iterable[str]) -> str:
     """Extract the first '# ' heading from each section, return as numbered list."""
     titles = []
     for section in sections:
@@ -60,13 +103,32 @@ def extract_titles(sections: list[str]) -> str:
     return "\n".join(f"{i+1}. {t}" for i, t in enumerate(titles))
 
 
-def batch_sections(sections: list[str], batch_size: int) -> list[str]:
-    """Group sections into batches, rejoining each with the original separator."""
-    batches = []
-    for i in range(0, len(sections), batch_size):
-        chunk = sections[i : i + batch_size]
-        batches.append(("\n" + SECTION_SEP + "\n").join(chunk))
-    return batches
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def batch_sections(sections: Iterable[str], batch_size: int, token_budget: int | None = None) -> Iterator[str]:
+    """Group sections into batches, rejoining each with the original separator.
+
+    Sections are packed greedily in order. A batch is closed when it holds
+    *batch_size* sections or when adding the next section would push its
+    estimated size past *token_budget*. A single oversized section still
+    gets a batch of its own.
+    """
+    current: list[str] = []
+    current_tokens = 0
+    for section in sections:
+        section_tokens = estimate_tokens(section)
+        full = len(current) >= batch_size
+        over_budget = token_budget is not None and current_tokens + section_tokens > token_budget
+        if current and (full or over_budget):
+            yield ("\n" + SECTION_SEP + "\n").join(current)
+            current = []
+            current_tokens = 0
+        current.append(section)
+        current_tokens += section_tokens
+    if current:
+        yield ("\n" + SECTION_SEP + "\n").join(current)
 
 
 def build_analysis_input(prompt: str, batch: str) -> str:
@@ -81,6 +143,97 @@ def build_codex_analysis_input(prompt: str, batch: str) -> str:
     )
 
 
+@dataclass
+class ResponseCache:
+    """On-disk cache of analysis responses keyed by (model, prompt, batch).
+
+    Entries are plain text files named by a blake2b digest of the request;
+    files older than *ttl_seconds* are ignored and overwritten on the next
+    successful call.
+    """
+
+    cache_dir: Path
+    ttl_seconds: float
+
+    def path_for(self, model: str, prompt: str, batch: str) -> Path:
+        key = hashlib.blake2b((model + prompt + batch).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.txt"
+
+    def get(self, model: str, prompt: str, batch: str) -> str | None:
+        path = self.path_for(model, prompt, batch)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def set(self, model: str, prompt: str, batch: str, response: str) -> None:
+        path = self.path_for(model, prompt, batch)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(response, encoding="utf-8")
+        tmp_path.replace(path)
+
+
+class AdmissionController:
+    """Concurrency gate whose capacity can be resized while calls are in flight.
+
+    Used like an asyncio.Semaphore (``async with gate:``), but the cap can be
+    lowered when the provider rate-limits and raised again as calls succeed,
+    up to the configured limit.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.cap = limit
+        self.active = 0
+        self._cond = asyncio.Condition(asyncio.Lock())
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.cap)
+            self.active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify(1)
+
+    def shrink(self) -> None:
+        """Admit one fewer concurrent call (never below one)."""
+        self.cap = max(1, self.cap - 1)
+
+    async def grow(self) -> None:
+        """Admit one more concurrent call, up to the configured limit."""
+        async with self._cond:
+            if self.cap < self.limit:
+                self.cap += 1
+                self._cond.notify_all()
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.release()
+
+
+def retry_wait(exc: anthropic.RateLimitError, attempt: int) -> float:
+    """Seconds to back off after a rate limit: the server's Retry-After if
+    given, else 10s, 20s, 40s, ... capped at MAX_RETRY_WAIT, with +/-20%
+    jitter so concurrent batches don't retry in lockstep."""
+    wait = 2 ** attempt * 10
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            wait = float(retry_after)
+        except ValueError:
+            pass
+    return min(wait, MAX_RETRY_WAIT) * random.uniform(0.8, 1.2)
+
+
 @dataclass
 class AnthropicAnalyzer:
     client: anthropic.AsyncAnthropic
@@ -90,15 +243,15 @@ class AnthropicAnalyzer:
         self,
         prompt: str,
         batch: str,
-        semaphore: asyncio.Semaphore,
+        gate: AdmissionController,
         label: str,
     ) -> str:
         """Send one batch to Claude and return the response text."""
         max_retries = 5
         for attempt in range(max_retries):
-            async with semaphore:
+            async with gate:
                 try:
-                    response = await self.client.messages.create(
+                    async with self.client.messages.stream(
                         model=self.model,
                         max_tokens=4096,
                         messages=[
@@ -107,14 +260,18 @@ class AnthropicAnalyzer:
                                 "content": build_analysis_input(prompt, batch),
                             }
                         ],
-                    )
-                    return response.content[0].text
-                except anthropic.RateLimitError:
+                    ) as stream:
+                        parts = [text async for text in stream.text_stream]
+                    await gate.grow()
+                    return "".join(parts)
+                except anthropic.RateLimitError as exc:
+                    gate.shrink()
                     if attempt == max_retries - 1:
                         raise
-                    wait = 2 ** attempt * 10  # 10s, 20s, 40s, 80s, 160s
-                    print(f"  Rate limited, retrying in {wait}s...")
-                    await asyncio.sleep(wait)
+                    wait = retry_wait(exc, attempt)
+            # Back off outside the gate so other batches can use the slot
+            print(f"  Rate limited, retrying in {wait:.0f}s...")
+            await asyncio.sleep(wait)
 
         raise RuntimeError(f"Anthropic analysis failed unexpectedly for: {label}")
 
@@ -127,11 +284,11 @@ class CodexExecAnalyzer:
         self,
         prompt: str,
         batch: str,
-        semaphore: asyncio.Semaphore,
+        gate: AdmissionController,
         label: str,
     ) -> str:
         stdin_text = build_codex_analysis_input(prompt, batch)
-        async with semaphore:
+        async with gate:
             return await self.runner.arun(stdin_text, label=label)
 
 
@@ -140,15 +297,48 @@ async def analyze_all(
     analyzer,
     prompt: str,
     concurrency: int,
+    model: str = "",
+    cache: ResponseCache | None = None,
 ) -> list[str]:
-    """Process all batches concurrently, returning responses in order."""
-    semaphore = asyncio.Semaphore(concurrency)
+    """Process all batches concurrently, returning responses in order.
+
+    When a *cache* is given, batches with a fresh cached response for the
+    same model and prompt are answered from disk without a model call.
+    Duplicate batches in the same run wait on the first one's result.
+    """
+    gate = AdmissionController(concurrency)
     total = len(batches)
     results: list[str | None] = [None] * total
+    loop = asyncio.get_running_loop()
+    # Identical batches within one run share a single model call
+    inflight: dict[bytes, asyncio.Future] = {}
 
     async def process(idx: int, batch: str) -> None:
         label = f"analysis batch {idx + 1}"
-        results[idx] = await analyzer.analyze(prompt, batch, semaphore, label)
+        cached = cache.get(model, prompt, batch) if cache else None
+        if cached is not None:
+            results[idx] = cached
+            print(f"  [{idx + 1}/{total}] Batch done (cached)")
+            return
+
+        key = hashlib.blake2b(batch.encode("utf-8")).digest()
+        future = loop.create_future()
+        existing = inflight.setdefault(key, future)
+        if existing is not future:
+            results[idx] = await existing
+            print(f"  [{idx + 1}/{total}] Batch done (duplicate)")
+            return
+
+        try:
+            results[idx] = await analyzer.analyze(prompt, batch, gate, label)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark as handled so an exception nobody awaits isn't logged
+            future.exception()
+            raise
+        future.set_result(results[idx])
+        if cache:
+            cache.set(model, prompt, batch, results[idx])
         print(f"  [{idx + 1}/{total}] Batch done")
 
     tasks = [process(i, b) for i, b in enumerate(batches)]
@@ -165,6 +355,8 @@ def main() -> int:
                         help="Path to a text file with the analysis prompt")
     parser.add_argument("--batch-size", type=int, default=20,
                         help="Max summaries per API request (default: 20)")
+    parser.add_argument("--batch-tokens", type=int, default=DEFAULT_BATCH_TOKENS,
+                        help=f"Approx input token budget per API request, prompt included (default: {DEFAULT_BATCH_TOKENS})")
     parser.add_argument("-o", "--output", default=None,
                         help="Output file (default: <input_dir>/analysis.md)")
     parser.add_argument("--anthropic-key",
@@ -178,6 +370,10 @@ def main() -> int:
                         help="Max parallel model calls (default: 5 for Anthropic, 1 for codex-exec)")
     parser.add_argument("--titles-only", action="store_true",
                         help="Send only video titles (not full summaries) in a single call")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the model instead of reusing cached batch responses")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL_HOURS,
+                        help=f"Hours a cached batch response stays valid (default: {DEFAULT_CACHE_TTL_HOURS})")
     args = parser.parse_args()
 
     input_dir = Path(args.input_dir)
@@ -222,25 +418,38 @@ def main() -> int:
     output_path = Path(args.output) if args.output else input_dir / "analysis.md"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    text = summaries_path.read_text(encoding="utf-8")
-    sections = parse_sections(text)
+    section_count = 0
 
-    if not sections:
+    def counted_sections() -> Iterator[str]:
+        nonlocal section_count
+        for section in iter_sections(summaries_path):
+            section_count += 1
+            yield section
+
+    if args.titles_only:
+        batches = [extract_titles(counted_sections())]
+    else:
+        token_budget = max(1, args.batch_tokens - estimate_tokens(prompt))
+        batches = list(batch_sections(counted_sections(), args.batch_size, token_budget))
+
+    if not section_count:
         print("No summary sections found in summaries.md.")
         return 0
 
     if args.titles_only:
-        titles_text = extract_titles(sections)
-        print(f"Extracted {len(sections)} titles, sending in a single call "
+        print(f"Extracted {section_count} titles, sending in a single call "
               f"with {model} via {args.provider}...\n")
-        batches = [titles_text]
     else:
-        batches = batch_sections(sections, args.batch_size)
-        print(f"Analyzing {len(sections)} summaries in {len(batches)} batches "
+        print(f"Analyzing {section_count} summaries in {len(batches)} batches "
               f"with {model} via {args.provider} (concurrency={args.concurrency})...\n")
 
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(input_dir / ".cache", args.cache_ttl * 3600)
+
     results = asyncio.run(
-        analyze_all(batches, analyzer, prompt, args.concurrency)
+        analyze_all(batches, analyzer, prompt, args.concurrency,
+                    model=f"{args.provider}:{model}", cache=cache)
     )
 
     output_path.write_text(("\n" + SECTION_SEP + "\n").join(results) + "\n", encoding="utf-8")
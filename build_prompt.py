@@ -9,14 +9,13 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import re
 import sys
 from pathlib import Path
 
 
 def extract_categories(text: str) -> list[str]:
     """Extract lines starting with '- ' from analysis output."""
-    return [m.group(0) for m in re.finditer(r"^- .+", text, re.MULTILINE)]
+    return [line for line in text.splitlines() if line.startswith("- ") and len(line) > 2]
 
 
 def main() -> int:
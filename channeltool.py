@@ -13,20 +13,29 @@ Usage:
 
 import argparse
 import asyncio
+import atexit
+import bisect
+import functools
 import json
 import os
 import sys
 import tempfile
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import quote
 import yt_dlp
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json writes the same index, just slower
+    orjson = None
+
 from yttranscribe import (
     download_transcript,
     deduplicate,
-    clean_text,
     entries_to_plain_text,
     format_timestamp,
 )
@@ -92,25 +101,266 @@ def extract_channel_slug(channel_url: str) -> str:
 # Index I/O
 # ---------------------------------------------------------------------------
 
+INDEX_EVENTS_FILE = "index.events.jsonl"
+
+
+def _dumps_json(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE if indent else orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+    return (json.dumps(obj, indent=2 if indent else None, ensure_ascii=False) + "\n").encode("utf-8")
+
+
 def load_index(output_dir: Path) -> dict:
-    """Load index.json from the output directory, or return an empty index."""
+    """Load index.json from the output directory, or return an empty index.
+
+    Per-video updates recorded by append_index_event() since the last
+    snapshot are replayed on top and compacted straight back into
+    index.json, so an interrupted transcribe run loses nothing that had
+    already completed and other tools reading index.json see it too.  If
+    index.json was rewritten after the last event (e.g. by summarize.py or
+    index_triage.py following a crash), the log is stale and is dropped
+    rather than replayed over those edits.
+    """
     index_path = output_dir / "index.json"
     if index_path.exists():
-        return json.loads(index_path.read_text(encoding="utf-8"))
-    return {"videos": []}
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    else:
+        index = {"videos": []}
+
+    events_path = output_dir / INDEX_EVENTS_FILE
+    if not events_path.exists():
+        return index
+    if index_path.exists() and index_path.stat().st_mtime_ns > events_path.stat().st_mtime_ns:
+        print(f"Warning: index.json is newer than {INDEX_EVENTS_FILE}; discarding the stale event log.")
+    else:
+        videos = index.setdefault("videos", [])
+        positions = {v["id"]: i for i, v in enumerate(videos)}
+        for line in events_path.read_bytes().splitlines():
+            if not line.strip():
+                continue
+            try:
+                video = json.loads(line)
+            except ValueError:
+                break  # torn last line from a crash mid-append
+            if video["id"] in positions:
+                videos[positions[video["id"]]] = video
+            else:
+                positions[video["id"]] = len(videos)
+                videos.append(video)
+    save_index(output_dir, index)
+    return index
 
 
 def save_index(output_dir: Path, index: dict) -> None:
-    """Write index.json to the output directory."""
+    """Write index.json to the output directory.
+
+    Writes to a temporary file first and renames it into place, so a crash
+    mid-write never leaves a truncated index.  The snapshot supersedes any
+    pending per-video events, which are discarded.
+    """
     index_path = output_dir / "index.json"
-    index_path.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n",
-                          encoding="utf-8")
+    tmp_path = index_path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(_dumps_json(index, indent=True))
+    os.replace(tmp_path, index_path)
+    (output_dir / INDEX_EVENTS_FILE).unlink(missing_ok=True)
+
+
+def append_index_event(output_dir: Path, video: dict) -> None:
+    """Record one video's current state without rewriting the whole index."""
+    with open(output_dir / INDEX_EVENTS_FILE, "ab") as f:
+        f.write(_dumps_json(video))
 
 
 # ---------------------------------------------------------------------------
 # Fetching channel videos
 # ---------------------------------------------------------------------------
 
+METADATA_PAGE_SIZE = 20  # playlist entries resolved per yt-dlp call
+METADATA_FIRST_PAGE = 4  # first page size: the stale-streak stop can end a re-run here
+METADATA_CONCURRENCY = 8  # parallel per-video lookups in the fallback path
+METADATA_RATE = 2.0  # sustained per-video lookups per second in the fallback path
+PAGE_RATE = 1.0  # max paged extractions started per second
+
+FLAT_OPTS = {
+    "extract_flat": "in_playlist",
+    "quiet": True,
+    "no_warnings": True,
+}
+
+PAGE_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "ignoreerrors": True,
+}
+
+
+_ydl_instances: list[yt_dlp.YoutubeDL] = []
+
+
+@functools.lru_cache(maxsize=8)
+def _make_ydl(opts_json: str) -> yt_dlp.YoutubeDL:
+    ydl = yt_dlp.YoutubeDL(json.loads(opts_json))
+    _ydl_instances.append(ydl)
+    return ydl
+
+
+@atexit.register
+def _close_ydls() -> None:
+    _make_ydl.cache_clear()
+    while _ydl_instances:
+        _ydl_instances.pop().close()
+
+
+def get_ydl(opts: dict) -> yt_dlp.YoutubeDL:
+    """Return a shared YoutubeDL instance for this exact option set.
+
+    Constructing a YoutubeDL registers every extractor and parses its
+    config, so instances are cached per distinct options and reused for
+    the rest of the process and closed at exit.  They are not thread-safe:
+    concurrent callers must use their own instances.
+    """
+    return _make_ydl(json.dumps(opts, sort_keys=True))
+
+
+class AsyncTokenBucket:
+    """Token-bucket rate limiter for asyncio tasks.
+
+    Allows bursts of up to *capacity* calls, refilling at *rate* tokens per
+    second; callers that find the bucket empty sleep until a token is due.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                # Holding the lock while waiting keeps callers in FIFO order
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1.0
+                self.updated = time.monotonic()
+            self.tokens -= 1
+
+
+def resolve_metadata_concurrently(
+    video_ids: list[str],
+    concurrency: int = METADATA_CONCURRENCY,
+    rate: float = METADATA_RATE,
+) -> list[dict | None]:
+    """Resolve metadata for each video ID with bounded concurrency.
+
+    yt-dlp is blocking, so extractions run in worker threads gated by an
+    asyncio semaphore and paced by a token bucket at *rate* lookups per
+    second, so bursts use the pool without tripping YouTube's throttling.
+    Each worker thread reuses one YoutubeDL instance
+    instead of constructing a new one per video.  Results are returned in
+    the order of *video_ids*; failed lookups come back as ``None``.
+    """
+    meta_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+    }
+    local = threading.local()
+    instances = []
+
+    def extract(video_id: str) -> dict | None:
+        ydl = getattr(local, "ydl", None)
+        if ydl is None:
+            ydl = local.ydl = yt_dlp.YoutubeDL(meta_opts)
+            instances.append(ydl)
+        return ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+
+    async def run_all(executor: ThreadPoolExecutor) -> list[dict | None]:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        bucket = AsyncTokenBucket(rate, concurrency)
+
+        async def fetch(video_id: str) -> dict | None:
+            async with semaphore:
+                await bucket.take()
+                try:
+                    return await loop.run_in_executor(executor, extract, video_id)
+                except Exception:
+                    return None
+
+        return await asyncio.gather(*(fetch(v) for v in video_ids))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            return asyncio.run(run_all(executor))
+        finally:
+            for ydl in instances:
+                ydl.close()
+
+
+def iter_entry_metadata(
+    playlist_info: dict,
+    entries: list[tuple[int, dict]],
+    page_size: int = METADATA_PAGE_SIZE,
+    first_page: int = METADATA_FIRST_PAGE,
+):
+    """Yield (position, video_id, metadata) for flat playlist *entries*.
+
+    *playlist_info* is the flat channel extraction and *entries* are
+    (1-based playlist position, flat entry) pairs taken from it.  Each page
+    is resolved with one ``process_ie_result`` call on a shared YoutubeDL,
+    which re-uses the flat listing instead of extracting the playlist again.
+    Pages are resolved lazily, so callers that stop iterating early skip the
+    remaining pages.  The first page holds *first_page* entries and each
+    later one doubles up to *page_size*, so a re-run that stops after a few
+    stale videos resolves little more than those.  Page starts are spaced
+    at most *PAGE_RATE* per second on a cumulative schedule, so pages that
+    already took longer than that are not delayed further.  Entries that could not be resolved are
+    yielded with ``None`` metadata.
+    """
+    ydl = get_ydl(PAGE_OPTS)
+    next_start = time.monotonic()
+    start = 0
+    size = min(first_page, page_size)
+    while start < len(entries):
+        now = time.monotonic()
+        if next_start > now:
+            time.sleep(next_start - now)
+        next_start = max(next_start, now) + 1 / PAGE_RATE
+        page = [(pos, entry.get("id") or entry.get("url"), entry) for pos, entry in entries[start:start + size]]
+        start += size
+        size = min(size * 2, page_size)
+        page_info = {**playlist_info, "entries": [entry for _, _, entry in page]}
+        try:
+            info = ydl.process_ie_result(page_info, download=False) or {}
+        except yt_dlp.utils.DownloadError:
+            info = {}
+        resolved = {e["id"]: e for e in info.get("entries") or [] if e and e.get("id")}
+        if not resolved:
+            # Some channel layouts do not resolve from the flat listing;
+            # fall back to resolving this page's videos individually.
+            print(f"  Paged extraction returned nothing, resolving {len(page)} video(s) individually...")
+            metas = resolve_metadata_concurrently([video_id for _, video_id, _ in page])
+            resolved = {video_id: meta for (_, video_id, _), meta in zip(page, metas)}
+        for pos, video_id, _ in page:
+            yield pos, video_id, resolved.get(video_id)
+
+
+def flat_entry_date(entry: dict) -> str | None:
+    """Return a flat playlist entry's upload date as YYYYMMDD, if it has one."""
+    if entry.get("upload_date"):
+        return entry["upload_date"]
+    timestamp = entry.get("timestamp") or entry.get("release_timestamp")
+    if timestamp:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y%m%d")
+    return None
+
+
 def fetch_channel_videos(channel_url: str, after_date: str, known_ids: set[str] | None = None) -> list[dict]:
     """Fetch non-Shorts videos from a YouTube channel uploaded after *after_date*.
 
@@ -127,14 +377,7 @@ def fetch_channel_videos(channel_url: str, after_date: str, known_ids: set[str]
     print(f"Scanning channel: {channel_url}")
     print(f"Looking for videos after {after_date}")
 
-    flat_opts = {
-        "extract_flat": "in_playlist",
-        "quiet": True,
-        "no_warnings": True,
-    }
-
-    with yt_dlp.YoutubeDL(flat_opts) as ydl:
-        info = ydl.extract_info(channel_url, download=False)
+    info = get_ydl(FLAT_OPTS).extract_info(channel_url, download=False)
 
     if not info or "entries" not in info:
         print("No videos found on this channel.")
@@ -148,31 +391,33 @@ def fetch_channel_videos(channel_url: str, after_date: str, known_ids: set[str]
     skipped_known = 0
     videos = []
 
-    meta_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "skip_download": True,
-    }
-
-    for i, entry in enumerate(entries):
+    candidates = list(enumerate(entries, start=1))
+    flat_dates = [flat_entry_date(entry) for entry in entries]
+    if entries and all(flat_dates):
+        # The flat listing is already dated: order newest-first and cut at
+        # the first entry older than the cutoff without probing any of them.
+        candidates.sort(key=lambda c: flat_dates[c[0] - 1], reverse=True)
+        neg_dates = [-int(flat_dates[pos - 1]) for pos, _ in candidates]
+        cut = bisect.bisect_right(neg_dates, -int(after_dt.strftime("%Y%m%d")))
+        print(f"  Flat listing is dated: {cut} entries on or after the cutoff.")
+        candidates = candidates[:cut]
+
+    to_fetch = []
+    for pos, entry in candidates:
         video_id = entry.get("id") or entry.get("url")
         if not video_id:
             continue
-
         if video_id in known_ids:
             skipped_known += 1
             continue
+        to_fetch.append((pos, entry))
 
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-
-        try:
-            with yt_dlp.YoutubeDL(meta_opts) as ydl:
-                meta = ydl.extract_info(video_url, download=False)
-        except Exception as exc:
-            print(f"  [{i+1}/{len(entries)}] Could not fetch metadata for {video_id}: {exc}")
-            time.sleep(1)
+    for pos, video_id, meta in iter_entry_metadata(info, to_fetch):
+        if meta is None:
+            print(f"  [{pos}/{len(entries)}] Could not fetch metadata for {video_id}")
             continue
 
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
         upload_date_str = meta.get("upload_date", "")  # YYYYMMDD
         duration = meta.get("duration") or 0
         title = meta.get("title", "")
@@ -181,29 +426,26 @@ def fetch_channel_videos(channel_url: str, after_date: str, known_ids: set[str]
         try:
             upload_dt = datetime.strptime(upload_date_str, "%Y%m%d")
         except (ValueError, TypeError):
-            time.sleep(0.5)
             continue
 
         # Filter: too old → increment stale streak
         if upload_dt < after_dt:
             stale_streak += 1
-            print(f"  [{i+1}/{len(entries)}] Skipping (before cutoff): {title} ({upload_date_str})")
+            print(f"  [{pos}/{len(entries)}] Skipping (before cutoff): {title} ({upload_date_str})")
             if stale_streak >= 3:
                 print("  Early termination: 3 consecutive videos older than cutoff.")
                 break
-            time.sleep(0.5)
             continue
 
         stale_streak = 0
 
         # Filter: too short → likely a Short that slipped through
         if duration < 120:
-            print(f"  [{i+1}/{len(entries)}] Skipping (< 120s): {title}")
-            time.sleep(0.5)
+            print(f"  [{pos}/{len(entries)}] Skipping (< 120s): {title}")
             continue
 
         iso_date = upload_dt.strftime("%Y-%m-%d")
-        print(f"  [{i+1}/{len(entries)}] {iso_date} | {title} ({duration}s)")
+        print(f"  [{pos}/{len(entries)}] {iso_date} | {title} ({duration}s)")
 
         videos.append({
             "id": video_id,
@@ -214,8 +456,6 @@ def fetch_channel_videos(channel_url: str, after_date: str, known_ids: set[str]
             "status": "pending",
         })
 
-        time.sleep(0.5)
-
     if skipped_known:
         print(f"\nSkipped {skipped_known} already-indexed video(s).")
     print(f"Collected {len(videos)} new video(s) after {after_date}.")
@@ -236,12 +476,11 @@ def transcribe_video_yt(video_id: str, lang: str = "en", timestamps: bool = True
         return None, str(exc)
 
     if timestamps:
-        lines = []
-        for entry in entries:
-            text = clean_text(entry.text.replace("\n", " "))
-            if text:
-                ts = format_timestamp(entry.start)
-                lines.append(f"**[{ts}]** {text}")
+        lines = [
+            f"**[{format_timestamp(start)}]** {text}"
+            for text, start in entries
+            if text
+        ]
         body = "\n\n".join(lines) if lines else None
     else:
         body = entries_to_plain_text(entries) or None
@@ -250,61 +489,79 @@ def transcribe_video_yt(video_id: str, lang: str = "en", timestamps: bool = True
     return body, error
 
 
-def download_audio_to(url: str, output_path: Path) -> Path:
-    """Download audio from a YouTube URL to *output_path* (mp3)."""
-    stem = str(output_path.with_suffix(""))  # yt-dlp adds extension after conversion
+def download_audio_to(url: str, output_path: Path) -> Path | None:
+    """Download audio from a YouTube URL next to *output_path*.
+
+    The original audio stream is kept (m4a when available) rather than
+    re-encoded, since AssemblyAI accepts it as is.  Returns the written
+    file, or None if nothing was downloaded.
+    """
+    stem = str(output_path.with_suffix(""))
     ydl_opts = {
-        "format": "bestaudio/best",
-        "postprocessors": [{
-            "key": "FFmpegExtractAudio",
-            "preferredcodec": "mp3",
-            "preferredquality": "192",
-        }],
-        "outtmpl": stem,
+        "format": "bestaudio[ext=m4a]/bestaudio",
+        "outtmpl": stem + ".%(ext)s",
         "quiet": True,
         "no_warnings": True,
     }
+    # Not get_ydl(): the output template differs per call and downloads run
+    # in concurrent worker threads, so each call gets its own instance
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         ydl.download([url])
-    return Path(stem + ".mp3")
+    written = sorted(output_path.parent.glob(output_path.with_suffix("").name + ".*"))
+    return written[0] if written else None
 
 
-def transcribe_video_assemblyai(
+async def transcribe_video_assemblyai(
     url: str,
     assemblyai_key: str,
-    anthropic_key: str,
-    model: str,
+    enhancer: Enhancer,
+    upload_gate: asyncio.Semaphore,
 ) -> str | None:
     """Download audio, transcribe with AssemblyAI, enhance with Claude.
 
-    Returns enhanced markdown text or None on failure.
+    Only the download and upload hold *upload_gate*; once the job is queued
+    the slot is released and the result is polled for separately, so many
+    AssemblyAI jobs can be in flight at once.  Returns enhanced markdown
+    text or None on failure.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        audio_path = download_audio_to(url, Path(tmpdir) / "audio")
-        if not audio_path.exists():
-            return None
-
-        transcriber = Transcriber(assemblyai_key)
-        utterances = transcriber.transcribe(audio_path)
-        if not utterances:
-            return None
-
-        enhancer = Enhancer(anthropic_key, model)
-        chunks = prepare_text_chunks(utterances)
-        enhanced = asyncio.run(enhancer.enhance_chunks(chunks))
-        return "\n\n".join(chunk.strip() for chunk in enhanced)
+    transcriber = Transcriber(assemblyai_key)
+
+    def download_and_submit() -> str | None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            audio_path = download_audio_to(url, Path(tmpdir) / "audio")
+            if audio_path is None:
+                return None
+            return transcriber.submit(audio_path)
+
+    async with upload_gate:
+        job_id = await asyncio.to_thread(download_and_submit)
+    if not job_id:
+        return None
+
+    utterances = await asyncio.to_thread(transcriber.await_result, job_id)
+    if not utterances:
+        return None
+
+    chunks = prepare_text_chunks(utterances)
+    enhanced = await enhancer.enhance_chunks(chunks)
+    return "\n\n".join(chunk.strip() for chunk in enhanced)
 
 
-def enhance_text(text: str, anthropic_key: str, model: str) -> str:
+async def enhance_text(text: str, enhancer: Enhancer) -> str:
     """Run existing text through Claude's Enhancer for readability cleanup."""
-    enhancer = Enhancer(anthropic_key, model)
-    # Split into manageable chunks (~8000 chars each)
+    # Split into manageable chunks (~8000 chars each), preferring paragraph breaks
     max_chunk = 8000
     chunks = []
-    while text:
-        chunks.append(text[:max_chunk])
-        text = text[max_chunk:]
-    enhanced = asyncio.run(enhancer.enhance_chunks(chunks))
+    start = 0
+    while start < len(text):
+        end = min(start + max_chunk, len(text))
+        if end < len(text):
+            cut = text.rfind("\n\n", start, end)
+            if cut > start:
+                end = cut + 2
+        chunks.append(text[start:end])
+        start = end
+    enhanced = await enhancer.enhance_chunks(chunks)
     return "\n\n".join(chunk.strip() for chunk in enhanced)
 
 
@@ -325,16 +582,19 @@ def save_transcript_file(
     filename = f"{video['upload_date']}_{video['id']}.md"
     path = transcripts_dir / filename
 
+    # JSON string syntax is valid YAML and survives quotes in the title
     frontmatter = (
         f"---\n"
-        f"title: \"{video['title']}\"\n"
+        f"title: {json.dumps(video['title'], ensure_ascii=False)}\n"
         f"url: {video['url']}\n"
         f"date: {video['upload_date']}\n"
         f"duration: {video['duration']}\n"
         f"method: {method}\n"
         f"---\n\n"
     )
-    path.write_text(frontmatter + body, encoding="utf-8")
+    with path.open("wb") as f:
+        f.write(frontmatter.encode("utf-8"))
+        f.write(body.encode("utf-8"))
     return path
 
 
@@ -342,6 +602,10 @@ def save_transcript_file(
 # Main processing loop
 # ---------------------------------------------------------------------------
 
+DEFAULT_CAPTION_CONCURRENCY = 3
+DEFAULT_ASSEMBLYAI_CONCURRENCY = 5
+
+
 def process_videos(
     output_dir: Path,
     enhance: bool = False,
@@ -351,8 +615,43 @@ def process_videos(
     lang: str = "en",
     timestamps: bool = True,
     proxy_configs: list | None = None,
+    caption_concurrency: int = DEFAULT_CAPTION_CONCURRENCY,
+    assemblyai_concurrency: int = DEFAULT_ASSEMBLYAI_CONCURRENCY,
+) -> None:
+    """Transcribe all pending videos in the index.
+
+    Videos are processed concurrently: up to *caption_concurrency* caption
+    fetches and *assemblyai_concurrency* AssemblyAI audio uploads at a time;
+    queued AssemblyAI jobs are then awaited without holding a slot.
+    Each completed video is appended to the index event log, so runs stay
+    resumable; index.json itself is rewritten once at the end.
+    """
+    asyncio.run(_process_videos_async(
+        output_dir,
+        enhance=enhance,
+        assemblyai_key=assemblyai_key,
+        anthropic_key=anthropic_key,
+        anthropic_model=anthropic_model,
+        lang=lang,
+        timestamps=timestamps,
+        proxy_configs=proxy_configs,
+        caption_concurrency=caption_concurrency,
+        assemblyai_concurrency=assemblyai_concurrency,
+    ))
+
+
+async def _process_videos_async(
+    output_dir: Path,
+    enhance: bool,
+    assemblyai_key: str | None,
+    anthropic_key: str | None,
+    anthropic_model: str,
+    lang: str,
+    timestamps: bool,
+    proxy_configs: list | None,
+    caption_concurrency: int,
+    assemblyai_concurrency: int,
 ) -> None:
-    """Transcribe all pending videos in the index."""
     index = load_index(output_dir)
     videos = index.get("videos", [])
     proxy_configs = proxy_configs or [None]
@@ -364,60 +663,88 @@ def process_videos(
 
     print(f"\n{len(pending)} pending video(s) to transcribe.\n")
 
-    for i, video in enumerate(pending):
-        print(f"[{i+1}/{len(pending)}] {video['title']}")
+    enhancer = Enhancer(anthropic_key, anthropic_model) if anthropic_key else None
+    caption_semaphore = asyncio.Semaphore(caption_concurrency)
+    assemblyai_semaphore = asyncio.Semaphore(assemblyai_concurrency)
+    index_lock = asyncio.Lock()
+    total = len(pending)
+
+    async def process(i: int, video: dict) -> None:
+        tag = f"[{i+1}/{total}]"
+        print(f"{tag} {video['title']}")
 
         body = None
         method = None
 
         # 1. Try YouTube captions
-        print("  Trying YouTube captions...")
         proxy_config = proxy_configs[i % len(proxy_configs)]
-        body, yt_error = transcribe_video_yt(video["id"], lang=lang, timestamps=timestamps, proxy_config=proxy_config)
+        async with caption_semaphore:
+            print(f"  {tag} Trying YouTube captions...")
+            body, yt_error = await asyncio.to_thread(
+                transcribe_video_yt, video["id"], lang=lang, timestamps=timestamps, proxy_config=proxy_config,
+            )
         if body:
             method = "youtube-captions"
-            if enhance and anthropic_key:
-                print("  Enhancing with Claude...")
-                body = enhance_text(body, anthropic_key, anthropic_model)
+            if enhance and enhancer:
+                print(f"  {tag} Enhancing with Claude...")
+                body = await enhance_text(body, enhancer)
                 method = "youtube-captions+enhanced"
-            print("  Success (YouTube captions).")
+            print(f"  {tag} Success (YouTube captions).")
 
         # 2. Fallback to AssemblyAI
         aai_error = None
-        if body is None and assemblyai_key and anthropic_key:
-            print("  YouTube captions unavailable, trying AssemblyAI...")
+        if body is None and assemblyai_key and enhancer:
+            print(f"  {tag} YouTube captions unavailable, trying AssemblyAI...")
             try:
-                body = transcribe_video_assemblyai(
-                    video["url"], assemblyai_key, anthropic_key, anthropic_model,
+                body = await transcribe_video_assemblyai(
+                    video["url"], assemblyai_key, enhancer, assemblyai_semaphore,
                 )
                 if body:
                     method = "assemblyai+enhanced"
-                    print("  Success (AssemblyAI).")
+                    print(f"  {tag} Success (AssemblyAI).")
                 else:
                     aai_error = "AssemblyAI returned empty transcript"
             except Exception as exc:
-                print(f"  AssemblyAI failed: {exc}")
+                print(f"  {tag} AssemblyAI failed: {exc}")
                 aai_error = str(exc)
 
         # 3. Update status
-        if body:
-            path = save_transcript_file(output_dir, video, body, method)
-            video["status"] = "transcribed"
-            video["method"] = method
-            video["transcript_file"] = str(path.relative_to(output_dir))
-            video.pop("failure_reason", None)  # clear if retrying a previously failed video
-            print(f"  Saved to {path}")
-        else:
-            video["status"] = "failed"
-            reasons = []
-            if yt_error:
-                reasons.append(f"YouTube captions: {yt_error}")
-            if aai_error:
-                reasons.append(f"AssemblyAI: {aai_error}")
-            video["failure_reason"] = "; ".join(reasons) if reasons else "No transcription method available"
-            print(f"  FAILED — {video['failure_reason']}")
-
-        # Save index after each video for resumability
+        async with index_lock:
+            if body:
+                path = save_transcript_file(output_dir, video, body, method)
+                video["status"] = "transcribed"
+                video["method"] = method
+                video["transcript_file"] = str(path.relative_to(output_dir))
+                video.pop("failure_reason", None)  # clear if retrying a previously failed video
+                print(f"  {tag} Saved to {path}")
+            else:
+                video["status"] = "failed"
+                reasons = []
+                if yt_error:
+                    reasons.append(f"YouTube captions: {yt_error}")
+                if aai_error:
+                    reasons.append(f"AssemblyAI: {aai_error}")
+                video["failure_reason"] = "; ".join(reasons) if reasons else "No transcription method available"
+                print(f"  {tag} FAILED — {video['failure_reason']}")
+
+            # Record each finished video for resumability; the full index is
+            # rewritten once at the end
+            append_index_event(output_dir, video)
+
+    async def process_isolated(i: int, video: dict) -> None:
+        # One video's enhancement or I/O error must not abort the batch
+        try:
+            await process(i, video)
+        except Exception as exc:
+            async with index_lock:
+                video["status"] = "failed"
+                video["failure_reason"] = f"{type(exc).__name__}: {exc}"
+                print(f"  [{i+1}/{total}] FAILED — {video['failure_reason']}")
+                append_index_event(output_dir, video)
+
+    try:
+        await asyncio.gather(*(process_isolated(i, v) for i, v in enumerate(pending)))
+    finally:
         save_index(output_dir, index)
 
     done = sum(1 for v in videos if v["status"] == "transcribed")
@@ -486,6 +813,8 @@ def cmd_transcribe(args: argparse.Namespace) -> int:
         lang=args.lang,
         timestamps=args.include_timestamps,
         proxy_configs=proxy_configs,
+        caption_concurrency=args.concurrency,
+        assemblyai_concurrency=args.assemblyai_concurrency,
     )
     return 0
 
@@ -532,6 +861,10 @@ def build_parser() -> argparse.ArgumentParser:
     p_trans.add_argument("--model", help="Anthropic model (or ANTHROPIC_MODEL env)")
     p_trans.add_argument("--webshare-user", help="Webshare proxy username (or WEBSHARE_PROXY_USER env)")
     p_trans.add_argument("--webshare-pass", help="Webshare proxy password (or WEBSHARE_PROXY_PASS env)")
+    p_trans.add_argument("--concurrency", type=int, default=DEFAULT_CAPTION_CONCURRENCY,
+                         help=f"Max parallel YouTube caption fetches (default: {DEFAULT_CAPTION_CONCURRENCY})")
+    p_trans.add_argument("--assemblyai-concurrency", type=int, default=DEFAULT_ASSEMBLYAI_CONCURRENCY,
+                         help=f"Max parallel AssemblyAI audio uploads (default: {DEFAULT_ASSEMBLYAI_CONCURRENCY})")
     p_trans.set_defaults(func=cmd_transcribe)
 
     # -- run --
@@ -552,6 +885,10 @@ def build_parser() -> argparse.ArgumentParser:
     p_run.add_argument("--model", help="Anthropic model (or ANTHROPIC_MODEL env)")
     p_run.add_argument("--webshare-user", help="Webshare proxy username (or WEBSHARE_PROXY_USER env)")
     p_run.add_argument("--webshare-pass", help="Webshare proxy password (or WEBSHARE_PROXY_PASS env)")
+    p_run.add_argument("--concurrency", type=int, default=DEFAULT_CAPTION_CONCURRENCY,
+                       help=f"Max parallel YouTube caption fetches (default: {DEFAULT_CAPTION_CONCURRENCY})")
+    p_run.add_argument("--assemblyai-concurrency", type=int, default=DEFAULT_ASSEMBLYAI_CONCURRENCY,
+                       help=f"Max parallel AssemblyAI audio uploads (default: {DEFAULT_ASSEMBLYAI_CONCURRENCY})")
     p_run.set_defaults(func=cmd_run)
 
     return parser
@@ -11,11 +11,15 @@ Usage:
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
 import re
 import sys
-import time
+import threading
+from bisect import bisect_left
+from itertools import accumulate
 from pathlib import Path
 
 import functools
@@ -24,14 +28,27 @@ import anthropic
 
 from llm_providers import CodexExecRunner, add_codex_arguments, resolve_codex_model
 
-# Force unbuffered prints
-print = functools.partial(print, flush=True)
+# Force unbuffered prints; the lock keeps lines from concurrent files whole
+_print_lock = threading.Lock()
+_print = functools.partial(print, flush=True)
+
+
+def print(*args, **kwargs):
+    with _print_lock:
+        _print(*args, **kwargs)
+
 
 DEFAULT_ANTHROPIC_MODEL = "claude-opus-4-6"
 DEFAULT_CHUNK_TOKENS = 20_000  # approx tokens per chunk
 DEFAULT_MAX_TOKENS = 32_768
 CHARS_PER_TOKEN = 4  # rough estimate
 SINGLE_PASS_THRESHOLD = 30_000  # tokens; below this, no chunking needed
+DEFAULT_PARALLEL = 4  # concurrent chunk calls per category
+SKIP_MERGE_FRACTION = 0.8  # of SINGLE_PASS_THRESHOLD; smaller merge inputs are concatenated
+
+SECTION_SEP_BYTES = b"\n" + b"-" * 36 + b"\n"
+HEADING_RE = re.compile(r"^(#{1,5})(\s+)", re.MULTILINE)
+BULLET_RE = re.compile(r"^\s*(?:[-*]|\d+\.)\s+\S")
 
 CODEX_CONSOLIDATION_SYSTEM_PROMPT = (
     "You are running a consolidation step in a YouTube summary processing pipeline. "
@@ -45,17 +62,23 @@ def estimate_tokens(text: str) -> int:
     return len(text) // CHARS_PER_TOKEN
 
 
-def split_into_summaries(text: str) -> list[str]:
+def split_into_summaries(raw: bytes) -> tuple[list[str], list[int]]:
     """Split a merged category file into individual video summaries.
 
     Each summary starts with a '---' separator followed by '## Source: channel'.
-    The first section (the category header) is discarded.
+    The first section (the category header) is discarded.  The split runs on
+    the raw bytes (the separator is ASCII); each part is decoded before it
+    is stripped, so Unicode whitespace such as NBSP is trimmed as in a
+    text-mode read.  Returns the summaries and, in a parallel list, their
+    token estimates.
     """
-    # Split on any horizontal rule (--- or longer dashes)
-    parts = re.split(r"\n-{36}\n", text)
+    if b"\r" in raw:
+        # Match a text-mode read, which turns \r\n and \r into \n
+        raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
     summaries = []
-    for part in parts:
-        part = part.strip()
+    tokens = []
+    for part in raw.split(SECTION_SEP_BYTES):
+        part = part.decode("utf-8").strip()
         if not part or part.startswith("# ") and "\n" not in part:
             # Category header line only
             continue
@@ -64,46 +87,206 @@ def split_into_summaries(text: str) -> list[str]:
             idx = part.index("## Source:")
             part = part[idx:]
         summaries.append(part)
-    return summaries
+        tokens.append(estimate_tokens(part))
+    return summaries, tokens
+
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_embedding_lock = threading.Lock()
+
+
+def load_embedding_cache(path: Path) -> dict[str, "numpy.ndarray"]:
+    """Load cached bullet embeddings keyed by the bullet's SHA-256 hex digest."""
+    import numpy
+
+    if not path.exists():
+        return {}
+    with numpy.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def save_embedding_cache(path: Path, cache: dict) -> None:
+    import numpy
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.stem + ".tmp.npz")
+    numpy.savez(tmp_path, **cache)
+    tmp_path.replace(path)
+
+
+def dedupe_bullets(
+    summaries: list[str],
+    threshold: float,
+    cache_path: Path,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+) -> tuple[list[str], int]:
+    """Drop bullet lines that are near-duplicates of an earlier bullet.
+
+    Bullets are embedded with a local sentence-transformers model, and a
+    bullet whose cosine similarity to any bullet already kept exceeds
+    *threshold* is removed.  Headers and other prose are never touched.
+    Embeddings are cached in *cache_path* so re-runs only embed new bullets.
+    Returns the rewritten summaries and the number of bullets dropped.
+    """
+    # Imported here so the heavy, optional dependencies only load when
+    # deduplication is requested
+    import numpy
+    from sentence_transformers import SentenceTransformer
+
+    lines_per_summary = [summary.splitlines() for summary in summaries]
+    bullets = [
+        (si, li, line.strip())
+        for si, lines in enumerate(lines_per_summary)
+        for li, line in enumerate(lines)
+        if BULLET_RE.match(line)
+    ]
+    if not bullets:
+        return summaries, 0
+
+    keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for _, _, text in bullets]
+    with _embedding_lock:  # files consolidated in parallel share the cache file
+        cache = load_embedding_cache(cache_path)
+        missing = sorted({key: text for key, (_, _, text) in zip(keys, bullets) if key not in cache}.items())
+        if missing:
+            print(f"  Embedding {len(missing)} new bullet(s) with {model_name}...")
+            model = SentenceTransformer(model_name)
+            vectors = model.encode([text for _, text in missing], normalize_embeddings=True)
+            for (key, _), vector in zip(missing, vectors):
+                cache[key] = numpy.asarray(vector, dtype=numpy.float32)
+            save_embedding_cache(cache_path, cache)
+
+    embeddings = numpy.stack([cache[key] for key in keys])
+    embeddings /= numpy.linalg.norm(embeddings, axis=1, keepdims=True)
+    kept = numpy.empty_like(embeddings)
+    n_kept = 0
+    drop: set[tuple[int, int]] = set()
+    for (si, li, _), vector in zip(bullets, embeddings):
+        if n_kept and float((kept[:n_kept] @ vector).max()) > threshold:
+            drop.add((si, li))
+        else:
+            kept[n_kept] = vector
+            n_kept += 1
 
+    deduped = [
+        "\n".join(line for li, line in enumerate(lines) if (si, li) not in drop)
+        for si, lines in enumerate(lines_per_summary)
+    ]
+    return deduped, len(drop)
 
-def chunk_summaries(summaries: list[str], chunk_tokens: int) -> list[list[str]]:
-    """Group summaries into balanced chunks that fit under the token limit.
 
-    Instead of greedy bin-packing (which leaves a small runt last chunk),
-    compute the ideal number of chunks and distribute evenly.
+class TokenCounter:
+    """Exact token counts from a tiktoken encoding, cached on disk.
+
+    tiktoken's cl100k_base is a close stand-in for Claude's tokenizer.
+    Counts are stored per text under *cache_dir* as ``<sha1>.int`` so
+    re-runs don't re-encode unchanged summaries.
     """
-    import math
-
-    total_tokens = sum(estimate_tokens(s) for s in summaries)
-    num_chunks = math.ceil(total_tokens / chunk_tokens)
-    if num_chunks < 1:
-        num_chunks = 1
-    target = total_tokens / num_chunks
-
-    chunks = []
-    current_chunk = []
-    current_tokens = 0
-
-    for summary in summaries:
-        summary_tokens = estimate_tokens(summary)
-        # Always put at least one summary per chunk
-        if current_chunk and current_tokens + summary_tokens > target:
-            chunks.append(current_chunk)
-            current_chunk = []
-            current_tokens = 0
-        current_chunk.append(summary)
-        current_tokens += summary_tokens
-
-    if current_chunk:
-        # Fold tiny remainders into the last chunk instead of creating a runt
-        if chunks and current_tokens < target * 0.3:
-            chunks[-1].extend(current_chunk)
+
+    def __init__(self, cache_dir: Path, encoding: str = "cl100k_base"):
+        import tiktoken  # optional; only needed with --count-tokens
+
+        self.encoding = tiktoken.get_encoding(encoding)
+        self.cache_dir = cache_dir
+
+    def count(self, text: str) -> int:
+        path = self.cache_dir / f"{hashlib.sha1(text.encode('utf-8')).hexdigest()}.int"
+        try:
+            return int(path.read_text())
+        except (FileNotFoundError, ValueError):
+            pass
+        n = len(self.encoding.encode(text, disallowed_special=()))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(str(n))
+        return n
+
+
+def count_bins_bfd(sizes: list[int], chunk_tokens: int) -> int:
+    """Count the chunks Best-Fit-Decreasing needs to hold every item.
+
+    Items are placed largest first, each into the chunk with the least room
+    left that still fits it; an item larger than *chunk_tokens* gets a
+    chunk of its own.
+    """
+    bins: list[int] = []  # remaining capacity per chunk
+    for size in sorted(sizes, reverse=True):
+        best = None
+        for b, room in enumerate(bins):
+            if room >= size and (best is None or room < bins[best]):
+                best = b
+        if best is None:
+            bins.append(chunk_tokens - size)
         else:
-            chunks.append(current_chunk)
+            bins[best] -= size
+    return len(bins)
+
+
+def pack_in_order(sizes: list[int], limit: int) -> list[list[int]]:
+    """Fill chunks in item order, starting a new one when *limit* would be exceeded."""
+    chunks: list[list[int]] = []
+    chunk_size = 0
+    for i, size in enumerate(sizes):
+        if not chunks or chunk_size + size > limit:
+            chunks.append([])
+            chunk_size = 0
+        chunks[-1].append(i)
+        chunk_size += size
     return chunks
 
 
+def pack_indices(sizes: list[int], chunk_tokens: int) -> list[list[int]]:
+    """Group item indices into balanced, contiguous chunks under the token limit.
+
+    Best-Fit-Decreasing sets the number of chunks, raised only if the items
+    cannot fit that many without reordering.  Items keep their original
+    order and are split into chunks of about equal size, cutting at the
+    item boundary nearest each even share.  If that would overfill a chunk,
+    the chunks are instead filled in order up to the smallest limit that
+    still needs no more chunks.  An item larger than *chunk_tokens* gets a
+    chunk of its own.
+    """
+    if not sizes:
+        return []
+    count = max(count_bins_bfd(sizes, chunk_tokens), len(pack_in_order(sizes, chunk_tokens)))
+    total = sum(sizes)
+    cum = list(accumulate(sizes))
+
+    cuts = [0]
+    for k in range(1, count):
+        target = total * k / count
+        cut = bisect_left(cum, target)  # cum[cut] >= target
+        # Cut before or after item *cut*, whichever lands nearer the share
+        before = cum[cut - 1] if cut else 0
+        if cut < len(sizes) and cum[cut] - target < target - before:
+            cut += 1
+        cuts.append(min(max(cut, cuts[-1] + 1), len(sizes) - (count - k)))
+    cuts.append(len(sizes))
+    if all(b - a == 1 or cum[b - 1] - (cum[a - 1] if a else 0) <= chunk_tokens
+           for a, b in zip(cuts, cuts[1:])):
+        return [list(range(a, b)) for a, b in zip(cuts, cuts[1:])]
+
+    # Binary-search the smallest in-order limit that still needs only
+    # *count* chunks; chunk_tokens itself always does
+    lo, hi = min(-(-total // count), chunk_tokens), chunk_tokens
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if len(pack_in_order(sizes, mid)) <= count:
+            hi = mid
+        else:
+            lo = mid + 1
+    return pack_in_order(sizes, lo)
+
+
+def chunk_summaries(summaries: list[str], chunk_tokens: int, tokens: list[int] | None = None) -> list[list[str]]:
+    """Pack summaries into chunks with ``pack_indices``.
+
+    *tokens* are precomputed per-summary estimates; they are derived from
+    the text when not given.
+    """
+    if tokens is None:
+        tokens = [estimate_tokens(s) for s in summaries]
+    return [[summaries[i] for i in indices] for indices in pack_indices(tokens, chunk_tokens)]
+
+
 CONSOLIDATE_PROMPT = """\
 You are given summaries from multiple YouTube videos about: {category}
 
@@ -153,7 +336,7 @@ def demote_markdown_headings(text: str, levels: int = 1) -> str:
         hashes = match.group(1)
         return "#" * min(6, len(hashes) + levels) + match.group(2)
 
-    return re.sub(r"^(#{1,5})(\s+)", repl, text, flags=re.MULTILINE)
+    return HEADING_RE.sub(repl, text)
 
 
 def concatenate_chunk_results(chunk_results: list[str]) -> str:
@@ -171,33 +354,40 @@ def write_artifact(path: Path, title: str, metadata: str, content: str) -> None:
     path.write_text(f"# {title}\n\n{metadata.strip()}\n\n{content.strip()}\n", encoding="utf-8")
 
 
-def call_anthropic(prompt: str, content: str, api_key: str | None, model: str, max_tokens: int = DEFAULT_MAX_TOKENS, retries: int = 3) -> str:
+class OutputTruncatedError(RuntimeError):
+    """A response stopped at its max_tokens output budget."""
+
+    def __init__(self, max_tokens: int):
+        super().__init__(f"Output truncated (hit {max_tokens} token limit)")
+        self.max_tokens = max_tokens
+
+
+async def call_anthropic(prompt: str, content: str, client: anthropic.AsyncAnthropic, model: str, max_tokens: int = DEFAULT_MAX_TOKENS, retries: int = 3) -> str:
     """Send a consolidation request to Claude using streaming, with retries."""
-    client = anthropic.Anthropic(api_key=api_key)
     for attempt in range(1, retries + 1):
         try:
             result_parts = []
             stop_reason = None
-            with client.messages.stream(
+            async with client.messages.stream(
                 model=model,
                 max_tokens=max_tokens,
                 messages=[
                     {"role": "user", "content": f"{prompt}\n\n---\n\n{content}"},
                 ],
             ) as stream:
-                for text in stream.text_stream:
+                async for text in stream.text_stream:
                     result_parts.append(text)
-                stop_reason = stream.get_final_message().stop_reason
+                stop_reason = (await stream.get_final_message()).stop_reason
             if stop_reason == "max_tokens":
-                print(f"\n  ERROR: Output truncated (hit {max_tokens} token limit). "
-                      f"Re-run with --max-tokens {max_tokens * 2} to get full output.")
-                sys.exit(1)
+                raise OutputTruncatedError(max_tokens)
             return "".join(result_parts).strip()
+        except OutputTruncatedError:
+            raise  # the same request would only truncate again
         except Exception as e:
             if attempt < retries:
                 wait = attempt * 5
-                print(f"\n  WARN: API error ({e}), retrying in {wait}s (attempt {attempt}/{retries})...", end=" ", flush=True)
-                time.sleep(wait)
+                print(f"  WARN: API error ({e}), retrying in {wait}s (attempt {attempt}/{retries})...")
+                await asyncio.sleep(wait)
             else:
                 print(f"\n  ERROR: API failed after {retries} attempts: {e}")
                 raise
@@ -205,23 +395,195 @@ def call_anthropic(prompt: str, content: str, api_key: str | None, model: str, m
 
 class AnthropicConsolidator:
     def __init__(self, api_key: str | None, model: str):
-        self.api_key = api_key
+        # One client for the whole run, so every call (across chunks and
+        # files) shares its connection pool
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = model
 
-    def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
-        return call_anthropic(prompt, content, self.api_key, self.model, max_tokens)
+    async def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
+        return await call_anthropic(prompt, content, self.client, self.model, max_tokens)
 
 
 class CodexExecConsolidator:
     def __init__(self, runner: CodexExecRunner):
         self.runner = runner
 
-    def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
+    async def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
         del max_tokens
-        return self.runner.run(build_codex_consolidation_input(prompt, content), label=label)
+        return await self.runner.arun(build_codex_consolidation_input(prompt, content), label=label)
+
+
+class BoundedConsolidator:
+    """Cap in-flight model calls across every file processed concurrently."""
+
+    def __init__(self, llm, max_inflight: int):
+        self.llm = llm
+        self.semaphore = asyncio.Semaphore(max(1, max_inflight))
+
+    async def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
+        async with self.semaphore:
+            return await self.llm.call(prompt, content, label, max_tokens)
+
+
+class CachedConsolidator:
+    """Wrap a consolidator with an exact-match on-disk response cache.
+
+    Entries live in *cache_dir* as text files named by the SHA-256 of
+    (model, max_tokens, prompt, content), so re-running a category with
+    unchanged inputs skips the model call entirely.
+    """
+
+    def __init__(self, llm, cache_dir: Path, model: str):
+        self.llm = llm
+        self.cache_dir = cache_dir
+        self.model = model
+
+    def path_for(self, prompt: str, content: str, max_tokens: int) -> Path:
+        key = hashlib.sha256(json.dumps(
+            {"m": self.model, "mt": max_tokens, "p": prompt, "c": content},
+            sort_keys=True,
+        ).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.txt"
+
+    async def call(self, prompt: str, content: str, label: str, max_tokens: int) -> str:
+        path = self.path_for(prompt, content, max_tokens)
+        try:
+            result = path.read_text(encoding="utf-8")
+            print(f"  {label}: cached response")
+            return result
+        except FileNotFoundError:
+            pass
+        result = await self.llm.call(prompt, content, label, max_tokens)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(result, encoding="utf-8")
+        tmp_path.replace(path)
+        return result
+
+
+async def call_many(
+    llm,
+    calls: list[tuple[str, str, str]],
+    max_tokens: int,
+    parallel: int,
+    allow_truncated: bool = False,
+) -> list[str | None]:
+    """Run independent (prompt, content, label) calls concurrently.
+
+    At most *parallel* requests are in flight at once.  Results come back
+    in the order of *calls*; each one is reported as it finishes.  With
+    *allow_truncated*, a response cut off at *max_tokens* comes back as
+    ``None`` instead of raising OutputTruncatedError.
+    """
+    semaphore = asyncio.Semaphore(max(1, parallel))
+
+    async def run(prompt: str, content: str, label: str) -> str | None:
+        async with semaphore:
+            try:
+                result = await llm.call(prompt, content, label, max_tokens)
+            except OutputTruncatedError:
+                if not allow_truncated:
+                    raise
+                print(f"    {label} → truncated at {max_tokens:,} tokens")
+                return None
+        print(f"    {label} → ~{estimate_tokens(result):,} tokens")
+        return result
 
+    return list(await asyncio.gather(*(run(*call) for call in calls)))
 
-def consolidate_file(
+
+RESULT_BOUNDARY = "<<<RESULT_BOUNDARY>>>"
+MODEL_CONTEXT_TOKENS = 200_000
+
+MULTI_TASK_SUFFIX = """
+
+The content below contains {k} independent tasks, each starting with a "# TASK n" line.
+Apply the instructions above to each task SEPARATELY; do not mix content between tasks.
+Output the results in task order. Put a line containing exactly {boundary} before each
+result, and nothing else on that line."""
+
+
+def pack_chunks_into_request(chunk_texts: list[str], k: int, token_cap: int) -> list[list[int]]:
+    """Group consecutive chunk indices into requests of at most *k* chunks.
+
+    A group is closed early when adding the next chunk would push its
+    estimated input past *token_cap*.
+    """
+    groups: list[list[int]] = []
+    group_tokens = 0
+    for i, text in enumerate(chunk_texts):
+        tokens = estimate_tokens(text)
+        if groups and len(groups[-1]) < k and group_tokens + tokens <= token_cap:
+            groups[-1].append(i)
+            group_tokens += tokens
+        else:
+            groups.append([i])
+            group_tokens = tokens
+    return groups
+
+
+def build_multi_task_content(texts: list[str]) -> str:
+    return "\n\n".join(f"# TASK {i}\n\n{text}" for i, text in enumerate(texts, start=1))
+
+
+def split_multi_task_result(result: str, expected: int) -> list[str] | None:
+    """Split a multi-task response on the boundary lines; None if the count is off."""
+    parts = [part.strip() for part in result.split(RESULT_BOUNDARY)]
+    parts = [part for part in parts if part]
+    return parts if len(parts) == expected else None
+
+
+async def call_packed(
+    llm,
+    calls: list[tuple[str, str, str]],
+    max_tokens: int,
+    parallel: int,
+    tasks_per_request: int,
+    token_cap: int,
+) -> list[str]:
+    """Like ``call_many``, but packs up to *tasks_per_request* calls that share
+    a prompt into one request.  Packed responses that are truncated at
+    *max_tokens*, which all of a request's tasks share, or that don't split
+    into the expected number of results are retried one call per chunk."""
+    prompt = calls[0][0]
+    groups = pack_chunks_into_request([content for _, content, _ in calls], tasks_per_request, token_cap)
+    packed_calls = []
+    for group in groups:
+        if len(group) == 1:
+            packed_calls.append(calls[group[0]])
+            continue
+        packed_prompt = prompt + MULTI_TASK_SUFFIX.format(k=len(group), boundary=RESULT_BOUNDARY)
+        content = build_multi_task_content([calls[i][1] for i in group])
+        label = " + ".join(calls[i][2] for i in group)
+        packed_calls.append((packed_prompt, content, label))
+
+    print(f"  Packed {len(calls)} calls into {len(packed_calls)} request(s)")
+    packed_results = await call_many(llm, packed_calls, max_tokens, parallel, allow_truncated=True)
+
+    results: list[str | None] = [None] * len(calls)
+    retry = []
+    for group, (_, _, label), result in zip(groups, packed_calls, packed_results):
+        if result is None:
+            if len(group) == 1:
+                raise OutputTruncatedError(max_tokens)
+            print(f"    WARN: packed response for {label} was truncated, retrying individually")
+            retry.extend(group)
+            continue
+        parts = [result] if len(group) == 1 else split_multi_task_result(result, len(group))
+        if parts is None:
+            print(f"    WARN: packed response for {label} "
+                  f"did not split into {len(group)} results, retrying individually")
+            retry.extend(group)
+            continue
+        for i, part in zip(group, parts):
+            results[i] = part
+    if retry:
+        for i, result in zip(retry, await call_many(llm, [calls[i] for i in retry], max_tokens, parallel)):
+            results[i] = result
+    return results
+
+
+async def consolidate_file(
     filepath: Path,
     output_dir: Path,
     llm,
@@ -230,13 +592,33 @@ def consolidate_file(
     dry_run: bool = False,
     final_merge: str = "model",
     intermediate_dir: Path | None = None,
+    dedup_threshold: float | None = None,
+    embedding_cache: Path | None = None,
+    parallel: int = DEFAULT_PARALLEL,
+    tasks_per_request: int = 1,
+    token_counter: TokenCounter | None = None,
+    force_merge: bool = False,
 ) -> Path | None:
-    """Consolidate a single merged category file."""
-    text = filepath.read_text()
+    """Consolidate a single merged category file.
+
+    Independent chunk and sub-merge calls run up to *parallel* at a time;
+    with *tasks_per_request* > 1, phase-1 chunks are packed that many to a
+    request.
+
+    With *dedup_threshold* set, near-duplicate bullets are removed locally
+    (see ``dedupe_bullets``) before anything is sent to the model.  With a
+    *token_counter*, chunking and the single-pass decision use its exact
+    counts instead of the characters-per-token estimate.  A model final
+    merge is replaced by concatenation when the phase-1 results are already
+    small, unless *force_merge* is set.
+    """
+    raw = filepath.read_bytes()
     category_name = filepath.stem.replace("_", " ").title()
 
-    summaries = split_into_summaries(text)
-    total_tokens = estimate_tokens(text)
+    summaries, tokens = split_into_summaries(raw)
+    # Byte length stands in for character count; merged files are mostly ASCII
+    total_tokens = len(raw) // CHARS_PER_TOKEN
+    text = None  # full decoded input, only needed for a single pass
 
     print(f"\n{'='*60}")
     print(f"Category: {category_name}")
@@ -246,16 +628,33 @@ def consolidate_file(
         print("  No summaries found, skipping.")
         return None
 
+    input_tokens = total_tokens
+    if dedup_threshold is not None:
+        summaries, dropped = await asyncio.to_thread(dedupe_bullets, summaries, dedup_threshold, embedding_cache)
+        text = "\n\n---\n\n".join(summaries)
+        tokens = [estimate_tokens(s) for s in summaries]
+        input_tokens = estimate_tokens(text)
+        print(f"  Semantic dedup dropped {dropped} near-duplicate bullet(s): "
+              f"~{total_tokens:,} → ~{input_tokens:,} tokens")
+
+    if token_counter is not None:
+        tokens = [token_counter.count(s) for s in summaries]
+        input_tokens = sum(tokens)
+        print(f"  Tokenizer count: {input_tokens:,} tokens")
+
     output_path = output_dir / filepath.name
     category_artifact_dir = intermediate_dir / filepath.stem if intermediate_dir else None
 
-    if total_tokens <= SINGLE_PASS_THRESHOLD:
+    if input_tokens <= SINGLE_PASS_THRESHOLD:
         # Single pass
         print("  Strategy: single pass (fits in context)")
         if dry_run:
             print("  [DRY RUN] Would consolidate in one call.")
             return None
 
+        if text is None:
+            text = raw.decode("utf-8")
+
         prompt = CONSOLIDATE_PROMPT.format(category=category_name)
         if category_artifact_dir:
             write_artifact(
@@ -264,7 +663,7 @@ def consolidate_file(
                 f"*Input: {len(summaries)} video summaries, ~{total_tokens:,} tokens*",
                 text,
             )
-        result = llm.call(prompt, text, category_name, max_tokens)
+        result = await llm.call(prompt, text, category_name, max_tokens)
         result_tokens = estimate_tokens(result)
         print(f"  Result: ~{result_tokens:,} tokens ({result_tokens/total_tokens*100:.0f}% of original)")
         if category_artifact_dir:
@@ -277,26 +676,27 @@ def consolidate_file(
 
     else:
         # Chunked consolidation
-        chunks = chunk_summaries(summaries, chunk_tokens)
+        chunk_indices = pack_indices(tokens, chunk_tokens)
+        chunks = [[summaries[i] for i in indices] for indices in chunk_indices]
+        # Per-chunk sizes from the cached estimates (separators not counted)
+        chunk_sizes = [sum(tokens[i] for i in indices) for indices in chunk_indices]
         merge_description = "model final merge" if final_merge == "model" else "deterministic final concat"
         print(f"  Strategy: chunked ({len(chunks)} chunks of ~{chunk_tokens:,} tokens, {merge_description})")
 
         if dry_run:
-            for i, chunk in enumerate(chunks):
-                ct = sum(estimate_tokens(s) for s in chunk)
+            for i, (chunk, ct) in enumerate(zip(chunks, chunk_sizes)):
                 print(f"    Chunk {i+1}: {len(chunk)} summaries, ~{ct:,} tokens")
             final_calls = 1 if final_merge == "model" else 0
-            print(f"  [DRY RUN] Would consolidate in {len(chunks)} + {final_calls} calls.")
+            print(f"  [DRY RUN] Would consolidate in {len(chunks)} + {final_calls} calls"
+                  f"{' (final merge skipped if phase-1 output is small)' if final_calls and not force_merge else ''}.")
             return None
 
         # Phase 1: consolidate each chunk
-        chunk_results = []
-        for i, chunk in enumerate(chunks):
+        prompt = CONSOLIDATE_PROMPT.format(category=category_name)
+        calls = []
+        for i, (chunk, ct) in enumerate(zip(chunks, chunk_sizes)):
             chunk_text = "\n\n---\n\n".join(chunk)
-            ct = estimate_tokens(chunk_text)
-            print(f"  Chunk {i+1}/{len(chunks)}: {len(chunk)} summaries, ~{ct:,} tokens ...", end=" ", flush=True)
-
-            prompt = CONSOLIDATE_PROMPT.format(category=category_name)
+            print(f"  Chunk {i+1}/{len(chunks)}: {len(chunk)} summaries, ~{ct:,} tokens")
             if category_artifact_dir:
                 write_artifact(
                     category_artifact_dir / f"chunk_{i+1:02d}_input.md",
@@ -304,18 +704,23 @@ def consolidate_file(
                     f"*Input: {len(chunk)} video summaries, ~{ct:,} tokens*",
                     chunk_text,
                 )
-            result = llm.call(prompt, chunk_text, f"{category_name} chunk {i+1}", max_tokens)
-            rt = estimate_tokens(result)
-            print(f"→ ~{rt:,} tokens")
-            if category_artifact_dir:
+            calls.append((prompt, chunk_text, f"{category_name} chunk {i+1}"))
+
+        print(f"  Consolidating {len(calls)} chunks, {parallel} at a time ...")
+        if tasks_per_request > 1:
+            token_cap = min(chunk_tokens * tasks_per_request, MODEL_CONTEXT_TOKENS - max_tokens)
+            chunk_results = await call_packed(llm, calls, max_tokens, parallel, tasks_per_request, token_cap)
+        else:
+            chunk_results = await call_many(llm, calls, max_tokens, parallel)
+        if category_artifact_dir:
+            for i, (ct, result) in enumerate(zip(chunk_sizes, chunk_results)):
+                rt = estimate_tokens(result)
                 write_artifact(
                     category_artifact_dir / f"chunk_{i+1:02d}_consolidated.md",
                     f"{category_name} - Chunk {i+1} Consolidated",
-                    f"*Output: ~{rt:,} tokens ({rt/ct*100:.0f}% of chunk input)*",
+                    f"*Output: ~{rt:,} tokens ({rt/max(ct, 1)*100:.0f}% of chunk input)*",
                     result,
                 )
-            chunk_results.append(result)
-            time.sleep(1)  # rate limit courtesy
 
         # Phase 2: merge chunk results
         merge_sections = chunk_results
@@ -331,7 +736,16 @@ def consolidate_file(
                 merged_input,
             )
 
-        if final_merge == "concat":
+        # Small enough merge inputs gain little from another model pass
+        skip_merge = (
+            final_merge == "model"
+            and not force_merge
+            and merge_tokens <= SINGLE_PASS_THRESHOLD * SKIP_MERGE_FRACTION
+        )
+        if final_merge == "concat" or skip_merge:
+            if skip_merge:
+                print(f"  Merge input is small (~{merge_tokens:,} tokens); skipping the model merge "
+                      f"(use --force-merge to run it)")
             result = concatenate_chunk_results(chunk_results)
             result_tokens = estimate_tokens(result)
             print(
@@ -339,35 +753,32 @@ def consolidate_file(
                 f"({result_tokens/total_tokens*100:.0f}% of original)"
             )
         else:
-            print(f"  Final merge: {len(merge_sections)} sections, ~{merge_tokens:,} tokens ...", end=" ", flush=True)
+            print(f"  Final merge: {len(merge_sections)} sections, ~{merge_tokens:,} tokens ...")
 
             if merge_tokens > SINGLE_PASS_THRESHOLD * 2:
                 # Chunk results are still too big — do another round
-                print(f"\n  WARNING: Merge input is large (~{merge_tokens:,} tokens). Doing recursive merge...")
-                sub_chunks = chunk_summaries(chunk_results, chunk_tokens)
-                sub_results = []
+                print(f"  WARNING: Merge input is large (~{merge_tokens:,} tokens). Doing recursive merge...")
+                sub_tokens = [token_counter.count(r) for r in chunk_results] if token_counter else None
+                sub_chunks = chunk_summaries(chunk_results, chunk_tokens, sub_tokens)
+                sub_calls = []
                 for i, sub in enumerate(sub_chunks):
                     sub_text = "\n\n---\n\n".join(f"## Section {j+1}\n\n{s}" for j, s in enumerate(sub))
-                    st = estimate_tokens(sub_text)
-                    print(f"    Sub-merge {i+1}/{len(sub_chunks)}: ~{st:,} tokens ...", end=" ", flush=True)
+                    print(f"    Sub-merge {i+1}/{len(sub_chunks)}: ~{estimate_tokens(sub_text):,} tokens")
                     prompt = MERGE_PROMPT.format(n=len(sub), category=category_name)
-                    r = llm.call(prompt, sub_text, f"{category_name} sub-merge {i+1}", max_tokens)
-                    rt = estimate_tokens(r)
-                    print(f"→ ~{rt:,} tokens")
-                    sub_results.append(r)
-                    time.sleep(1)
+                    sub_calls.append((prompt, sub_text, f"{category_name} sub-merge {i+1}"))
+                sub_results = await call_many(llm, sub_calls, max_tokens, parallel)
 
                 merge_sections = sub_results
                 merged_input = "\n\n---\n\n".join(
                     f"## Section {i+1}\n\n{r}" for i, r in enumerate(merge_sections)
                 )
                 merge_tokens = estimate_tokens(merged_input)
-                print(f"  Final merge (after recursive): ~{merge_tokens:,} tokens ...", end=" ", flush=True)
+                print(f"  Final merge (after recursive): ~{merge_tokens:,} tokens ...")
 
             prompt = MERGE_PROMPT.format(n=len(merge_sections), category=category_name)
-            result = llm.call(prompt, merged_input, f"{category_name} final merge", max_tokens)
+            result = await llm.call(prompt, merged_input, f"{category_name} final merge", max_tokens)
             result_tokens = estimate_tokens(result)
-            print(f"→ ~{result_tokens:,} tokens ({result_tokens/total_tokens*100:.0f}% of original)")
+            print(f"  {category_name} final merge → ~{result_tokens:,} tokens ({result_tokens/total_tokens*100:.0f}% of original)")
 
     # Write output
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -393,15 +804,32 @@ def main():
                         help="Model provider to use (default: anthropic)")
     add_codex_arguments(parser)
     parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS, help=f"Tokens per chunk (default: {DEFAULT_CHUNK_TOKENS})")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL,
+                        help=f"Max concurrent chunk calls per category (default: {DEFAULT_PARALLEL})")
+    parser.add_argument("--file-parallel", type=int, default=1,
+                        help="Consolidate up to this many files at once; --parallel then caps model calls "
+                             "across all of them (default: 1)")
+    parser.add_argument("--tasks-per-request", type=int, default=1,
+                        help="Pack up to this many phase-1 chunks into one model request (default: 1, no packing)")
     parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS, help=f"Max output tokens per LLM call (default: {DEFAULT_MAX_TOKENS})")
     parser.add_argument("--final-merge", choices=["model", "concat"], default="model",
                         help="Final chunk merge strategy: model rewrite or deterministic concat (default: model)")
+    parser.add_argument("--force-merge", action="store_true",
+                        help="Always run the model final merge, even when phase-1 output is small enough to concatenate")
     parser.add_argument("--save-intermediates", action="store_true",
                         help="Persist raw chunk inputs and first-pass consolidated chunks under <output>/_chunks/")
     parser.add_argument("--intermediate-dir", default=None,
                         help="Directory for --save-intermediates artifacts (default: <output>/_chunks)")
     parser.add_argument("--dry-run", action="store_true", help="Show plan without making API calls")
     parser.add_argument("--skip-existing", action="store_true", help="Skip files that already exist in output")
+    parser.add_argument("--count-tokens", action="store_true",
+                        help="Size chunks with exact tiktoken counts instead of the ~4 chars/token estimate; "
+                             "needs tiktoken (default: off)")
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                        help="Drop bullets whose embedding cosine similarity to an earlier bullet exceeds this "
+                             "(e.g. 0.92) before calling the model; needs numpy and sentence-transformers (default: off)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the model instead of reusing responses cached under <output>/.cache/consolidate/")
     args = parser.parse_args()
 
     if args.dry_run:
@@ -456,27 +884,87 @@ def main():
         print("No .md files found.")
         return 1
 
+    if args.dedup_threshold is not None:
+        try:
+            import numpy  # noqa: F401
+            import sentence_transformers  # noqa: F401
+        except ImportError:
+            print("Error: --dedup-threshold needs numpy and sentence-transformers "
+                  "(pip install numpy sentence-transformers)")
+            return 1
+
+    token_counter = None
+    if args.count_tokens:
+        try:
+            token_counter = TokenCounter(output_dir / ".cache" / "tokens")
+        except ImportError:
+            print("Error: --count-tokens needs tiktoken (pip install tiktoken)")
+            return 1
+
+    if llm is not None and args.file_parallel > 1 and len(files) > 1:
+        # --parallel becomes the cap on model calls across all files
+        llm = BoundedConsolidator(llm, args.parallel)
+    if llm is not None and not args.no_cache:
+        llm = CachedConsolidator(llm, output_dir / ".cache" / "consolidate", f"{args.provider}:{model}")
+
     print(f"Will consolidate {len(files)} file(s) → {output_dir}/ with {model} via {args.provider}")
     if args.final_merge == "concat":
         print("Final merge strategy: deterministic concat")
     if intermediate_dir:
         print(f"Intermediate artifacts: {intermediate_dir}/")
 
-    for filepath in files:
-        if args.skip_existing and (output_dir / filepath.name).exists():
-            print(f"\nSkipping {filepath.name} (already exists)")
-            continue
-        consolidate_file(
-            filepath,
-            output_dir,
-            llm,
-            args.chunk_tokens,
-            args.max_tokens,
-            args.dry_run,
-            args.final_merge,
-            intermediate_dir,
-        )
+    if args.skip_existing:
+        for filepath in files:
+            if (output_dir / filepath.name).exists():
+                print(f"\nSkipping {filepath.name} (already exists)")
+        files = [f for f in files if not (output_dir / f.name).exists()]
+
+    truncated: list[Path] = []
+
+    async def run(filepath: Path) -> Path | None:
+        try:
+            return await consolidate_file(
+                filepath,
+                output_dir,
+                llm,
+                args.chunk_tokens,
+                args.max_tokens,
+                args.dry_run,
+                args.final_merge,
+                intermediate_dir,
+                args.dedup_threshold,
+                output_dir / ".cache" / "embeddings.npz",
+                args.parallel,
+                args.tasks_per_request,
+                token_counter,
+                args.force_merge,
+            )
+        except OutputTruncatedError as exc:
+            # Fail only this file; other files keep going and get written
+            print(f"\n  ERROR: {filepath.name}: {exc}. "
+                  f"Re-run with --max-tokens {exc.max_tokens * 2} to get full output.")
+            truncated.append(filepath)
+            return None
 
+    async def run_all() -> None:
+        if args.file_parallel > 1 and len(files) > 1:
+            print(f"Consolidating up to {args.file_parallel} files at a time")
+            file_semaphore = asyncio.Semaphore(args.file_parallel)
+
+            async def run_bounded(filepath: Path) -> Path | None:
+                async with file_semaphore:
+                    return await run(filepath)
+
+            await asyncio.gather(*(run_bounded(filepath) for filepath in files))
+        else:
+            for filepath in files:
+                await run(filepath)
+
+    asyncio.run(run_all())
+
+    if truncated:
+        print(f"\nDone, but {len(truncated)} file(s) were truncated: {', '.join(f.name for f in truncated)}")
+        return 1
     print(f"\nDone!")
     return 0
 
@@ -2,39 +2,94 @@ import sys
 import yt_dlp
 import os
 
-def download_audio(url):
+def download_audio(url, transcode=False):
     # We use a fixed filename 'input' so it's easy to pass to the next script.
-    # yt-dlp will automatically add the .mp3 extension after conversion.
+    # By default the original audio stream is kept (m4a when available), since
+    # transcription tools accept it directly; --transcode re-encodes to mp3.
     filename = 'input'
-    
-    # Remove old file if it exists so we don't get 'input.mp3' and 'input (1).mp3'
-    if os.path.exists('input.mp3'):
-        os.remove('input.mp3')
 
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-        'outtmpl': filename, # saves as input.webm/m4a first, then converts
-        'quiet': False,
-        'no_warnings': True,
-    }
+    ydl_opts = audio_opts(f'{filename}.%(ext)s', transcode)
+    # A previous input.<ext> of the same type belongs to another video
+    ydl_opts['overwrites'] = True
 
-    print(f"Downloading and converting: {url}")
+    print(f"Downloading{' and converting' if transcode else ''}: {url}")
     
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        print(f"\nSuccess! File saved as: {filename}.mp3")
+            info = ydl.extract_info(url, download=True)
+        # The info dict records the file actually written, after any postprocessing
+        path = info['requested_downloads'][0]['filepath']
+        remove_stale_audio(filename, keep=path)
+        print(f"\nSuccess! File saved as: {path}")
+        return path
     except Exception as e:
         print(f"Error: {e}")
 
+# Extensions yt-dlp may write for a bestaudio download (or the mp3 transcode)
+AUDIO_EXTS = ('m4a', 'webm', 'opus', 'ogg', 'mp3', 'aac', 'mp4')
+
+def remove_stale_audio(filename, keep):
+    # Drop earlier downloads so 'input.m4a' doesn't sit next to a stale
+    # 'input.webm'; only known audio outputs are touched, never input.txt etc.
+    keep = os.path.abspath(keep)
+    for ext in AUDIO_EXTS:
+        old = f'{filename}.{ext}'
+        if os.path.isfile(old) and os.path.abspath(old) != keep:
+            os.remove(old)
+
+def download_many(urls, transcode=False):
+    # Several videos go through one YoutubeDL call, which reuses its HTTP
+    # connections and extractor state; files are named by video id so they
+    # don't collide.
+    ydl_opts = audio_opts('%(id)s.%(ext)s', transcode)
+    ydl_opts['ignoreerrors'] = True
+
+    print(f"Downloading{' and converting' if transcode else ''} {len(urls)} videos")
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        failed = ydl.download(urls)
+    if failed:
+        print("\nSome downloads failed, see errors above.")
+    else:
+        print(f"\nSuccess! Saved {len(urls)} files as <video_id>.<ext>")
+
+def audio_opts(outtmpl, transcode):
+    ydl_opts = {
+        'format': 'bestaudio[ext=m4a]/bestaudio',
+        'outtmpl': outtmpl,
+        'concurrent_fragment_downloads': 8,  # parallel DASH/HLS fragments
+        'quiet': False,
+        'no_warnings': True,
+    }
+    if transcode:
+        ydl_opts['format'] = 'bestaudio/best'
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            'preferredquality': '192',
+        }]
+    return ydl_opts
+
+def read_urls(args):
+    # Each argument is a URL, or a text file with one URL per line
+    urls = []
+    for arg in args:
+        if os.path.isfile(arg):
+            with open(arg) as f:
+                urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+        else:
+            urls.append(arg)
+    return urls
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python get_audio.py <youtube_url>")
+    args = [a for a in sys.argv[1:] if a != '--transcode']
+    if not args:
+        print("Usage: python get_audio.py <youtube_url | urls.txt>... [--transcode]")
         sys.exit(1)
         
-    download_audio(sys.argv[1])
\ No newline at end of file
+    transcode = '--transcode' in sys.argv[1:]
+    urls = read_urls(args)
+    if len(urls) == 1:
+        download_audio(urls[0], transcode=transcode)
+    else:
+        download_many(urls, transcode=transcode)
@@ -13,6 +13,7 @@ import argparse
 import json
 import os
 import re
+import shutil
 import sys
 from pathlib import Path
 
@@ -35,11 +36,21 @@ def filename_to_label(filename: str) -> str:
     return stem.replace("_", " ").title()
 
 
+def slugify(name: str) -> str:
+    """Reduce a channel or category name to a case/punctuation-insensitive key."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
 def label_to_filename(label: str) -> str:
     """Convert a human-readable label to a snake_case filename."""
-    slug = label.lower().strip()
-    slug = re.sub(r"[^a-z0-9]+", "_", slug).strip("_")
-    return slug + ".md"
+    return slugify(label) + ".md"
+
+
+def lookup_slug(table: dict, name: str, by_slug: dict):
+    """Look up name exactly, falling back to its canonical slug."""
+    if name in table:
+        return table[name]
+    return by_slug.get(slugify(name))
 
 
 def collect_categories(
@@ -71,7 +82,7 @@ def collect_categories(
 
 def build_merge_prompt(channels: dict[str, list[dict]], min_cats: int, max_cats: int) -> str:
     """Build the prompt for the LLM merge call."""
-    lines = [
+    header = "\n".join((
         "You are given per-channel video category names from multiple YouTube channels.",
         "All channels cover career/job-search advice but each has its own category scheme.",
         "",
@@ -85,14 +96,12 @@ def build_merge_prompt(channels: dict[str, list[dict]], min_cats: int, max_cats:
         "",
         "Input categories by channel:",
         "",
-    ]
-    for channel, cats in channels.items():
-        lines.append(f"### {channel}")
-        for c in cats:
-            lines.append(f"- {c['label']}")
-        lines.append("")
-
-    lines.extend([
+    ))
+    channel_blocks = (
+        f"### {channel}\n" + "\n".join(f"- {c['label']}" for c in cats) + "\n"
+        for channel, cats in channels.items()
+    )
+    trailer = "\n".join((
         "Output ONLY valid JSON (no markdown fences) with this structure:",
         '{',
         '  "unified_categories": ["Category Name 1", "Category Name 2", ...],',
@@ -104,8 +113,8 @@ def build_merge_prompt(channels: dict[str, list[dict]], min_cats: int, max_cats:
         '    ...',
         '  }',
         '}',
-    ])
-    return "\n".join(lines)
+    ))
+    return "\n".join((header, *channel_blocks, trailer))
 
 
 def build_codex_merge_input(prompt: str) -> str:
@@ -142,47 +151,59 @@ def do_merge(
     channels: dict[str, list[dict]],
     taxonomy: dict,
 ):
-    """Create unified category files by appending source content."""
+    """Create unified category files from each channel's source content.
+
+    Contributions are collected per unified category, then each file is
+    written once, copying source files in as raw bytes.
+    """
     merged_dir.mkdir(parents=True, exist_ok=True)
     mapping = taxonomy["mapping"]
 
-    # Create empty files for each unified category
+    # Distinct names can share a filename, so contributions are grouped by
+    # target file; as before, the last such name supplies the header
     unified_files = {}
+    headers: dict[Path, str] = {}
+    sources: dict[Path, list[tuple[str, Path]]] = {}
     for cat_name in taxonomy["unified_categories"]:
-        fname = label_to_filename(cat_name)
-        fpath = merged_dir / fname
+        fpath = merged_dir / label_to_filename(cat_name)
         unified_files[cat_name] = fpath
-        # Write header
-        fpath.write_text(f"# {cat_name}\n\n")
+        headers[fpath] = cat_name
+        sources[fpath] = []
+
+    # The model may echo channel folders, category labels and unified names
+    # with different case or punctuation, so fall back to slug lookups
+    mapping_by_slug = {slugify(k): v for k, v in mapping.items()}
+    unified_by_slug = {slugify(name): name for name in unified_files}
 
-    # Append each channel's category content
+    # Collect each channel's category content
     for channel, cats in channels.items():
-        chan_mapping = mapping.get(channel, {})
+        chan_mapping = lookup_slug(mapping, channel, mapping_by_slug) or {}
+        labels_by_slug = {slugify(k): v for k, v in chan_mapping.items()}
         for cat in cats:
-            unified_name = chan_mapping.get(cat["label"])
-            if not unified_name:
+            mapped = lookup_slug(chan_mapping, cat["label"], labels_by_slug)
+            if not mapped:
                 print(f"  WARNING: No mapping for {channel}/{cat['label']}, skipping")
                 continue
-            target = unified_files.get(unified_name)
-            if not target:
-                print(f"  WARNING: Unified category '{unified_name}' not found, skipping")
+            unified_name = mapped if mapped in unified_files else unified_by_slug.get(slugify(mapped))
+            if not unified_name:
+                print(f"  WARNING: Unified category '{mapped}' not found, skipping")
                 continue
 
-            content = cat["path"].read_text()
-            with open(target, "a") as f:
-                f.write(f"\n------------------------------------\n\n## Source: {channel}\n\n")
-                f.write(content)
-                f.write("\n")
+            sources[unified_files[unified_name]].append((channel, cat["path"]))
+
+    for fpath, contributions in sources.items():
+        with open(fpath, "wb") as out:
+            out.write(f"# {headers[fpath]}\n\n".encode("utf-8"))
+            for channel, path in contributions:
+                out.write(f"\n------------------------------------\n\n## Source: {channel}\n\n".encode("utf-8"))
+                with open(path, "rb") as src:
+                    shutil.copyfileobj(src, out, length=1 << 20)
+                out.write(b"\n")
 
     # Print summary
     print(f"\nUnified taxonomy ({len(taxonomy['unified_categories'])} categories):")
     for cat_name in taxonomy["unified_categories"]:
-        fpath = unified_files[cat_name]
-        # Count video entries (lines starting with '# ' that aren't the header)
-        lines = fpath.read_text().splitlines()
-        # Count source sections
-        sources = sum(1 for l in lines if l.startswith("## Source:"))
-        print(f"  {cat_name} ({sources} channel contributions)")
+        print(f"  {cat_name} ({len(sources[unified_files[cat_name]])} channel contributions)")
 
 
 def main():
@@ -9,50 +9,82 @@ Usage:
 """
 
 import argparse
+import os
 import re
 import sys
 from pathlib import Path
+from typing import Iterator
 
-URL_PATTERN = re.compile(r"https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+")
+# Outliers are matched on the video ID captured from each URL
+URL_PATTERN = re.compile(r"https://www\.youtube\.com/watch\?v=([A-Za-z0-9_-]+)")
+METADATA_URL_RE = re.compile(rb"\*\*URL:\*\*\s*https://www\.youtube\.com/watch\?v=([A-Za-z0-9_-]+)")
+VERSIONED_STEM_RE = re.compile(r"summaries(?:_v(\d+))?")
+SUMMARIES_VERSION_RE = re.compile(r"summaries_v([1-9]\d*)\.md")
 
 SECTION_SEP = "-" * 36
+SECTION_SEP_BYTES = ("\n" + SECTION_SEP + "\n").encode()
+# bytes.strip() only knows ASCII whitespace, while str.strip() also drops
+# \x1c-\x1f and Unicode spaces such as NBSP and U+2028, whose UTF-8 forms
+# start with a byte >= 0x80; sections with such an edge byte are decoded
+UNICODE_STRIP_EDGE = frozenset(range(0x1C, 0x20)) | frozenset(range(0x80, 0x100))
 
 
 def find_latest_summaries(input_dir: Path) -> Path:
-    """Find the highest-versioned summaries file, falling back to summaries.md."""
-    base = input_dir / "summaries.md"
-    latest = base
-    version = 2
-    while (candidate := input_dir / f"summaries_v{version}.md").exists():
-        latest = candidate
-        version += 1
-    if not latest.exists():
-        return base  # let caller handle the missing-file error
+    """Find the highest-versioned summaries file, falling back to summaries.md.
+
+    The directory is listed once rather than probing each version in turn.
+    """
+    latest = input_dir / "summaries.md"  # caller handles a missing file
+    version = 1
+    try:
+        with os.scandir(input_dir) as it:
+            for entry in it:
+                m = SUMMARIES_VERSION_RE.fullmatch(entry.name)
+                if m and int(m.group(1)) > version and entry.is_file():
+                    version = int(m.group(1))
+                    latest = Path(entry.path)
+    except OSError:
+        pass
     return latest
 
 
-def extract_outlier_urls(analysis_text: str) -> set[str]:
-    """Extract all YouTube URLs from the analysis output."""
+def extract_outlier_ids(analysis_text: str) -> set[str]:
+    """Extract the video IDs of all YouTube URLs in the analysis output."""
     return set(URL_PATTERN.findall(analysis_text))
 
 
-def parse_sections(text: str) -> list[str]:
-    """Split summaries.md on section separator, dropping empty sections."""
-    parts = text.split("\n" + SECTION_SEP + "\n")
-    return [s.strip() for s in parts if s.strip()]
-
-
-def extract_url_from_section(section: str) -> str | None:
-    """Extract the URL from a section's **URL:** metadata line."""
-    m = re.search(r"\*\*URL:\*\*\s*(https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+)", section)
-    return m.group(1) if m else None
+def iter_sections(raw: bytes) -> Iterator[bytes]:
+    """Yield the stripped, non-empty sections of a raw summaries file."""
+    if b"\r" in raw:
+        # Match a text-mode read, which turns \r\n and \r into \n
+        raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    start = 0
+    while start <= len(raw):
+        end = raw.find(SECTION_SEP_BYTES, start)
+        if end == -1:
+            end = len(raw)
+        section = raw[start:end].strip()
+        if section and (section[0] in UNICODE_STRIP_EDGE or section[-1] in UNICODE_STRIP_EDGE):
+            section = section.decode("utf-8").strip().encode("utf-8")
+        if section:
+            yield section
+        start = end + len(SECTION_SEP_BYTES)
+
+
+def extract_id_from_section(section: bytes) -> str | None:
+    """Extract the video ID from a section's **URL:** metadata line."""
+    i = section.find(b"**URL:**")
+    if i == -1:
+        return None
+    m = METADATA_URL_RE.search(section, i)
+    return m.group(1).decode("ascii") if m else None
 
 
 def next_version_path(base_path: Path) -> Path:
     """Find the next available summaries_vN.md path."""
     parent = base_path.parent
     suffix = base_path.suffix  # ".md"
-    match = re.fullmatch(r"summaries(?:_v(\d+))?", base_path.stem)
+    match = VERSIONED_STEM_RE.fullmatch(base_path.stem)
     if not match:
         stem = base_path.stem
         version = 2
@@ -94,17 +126,11 @@ def main() -> int:
 
     # Extract outlier URLs from analysis
     analysis_text = analysis_path.read_text(encoding="utf-8")
-    outlier_urls = extract_outlier_urls(analysis_text)
-    if not outlier_urls:
+    outlier_ids = extract_outlier_ids(analysis_text)
+    if not outlier_ids:
         print("No outlier URLs found in analysis file. Nothing to prune.")
         return 0
 
-    # Parse and filter summaries
-    text = summaries_path.read_text(encoding="utf-8")
-    sections = parse_sections(text)
-    kept = [s for s in sections if extract_url_from_section(s) not in outlier_urls]
-    removed = len(sections) - len(kept)
-
     # Determine output path
     if args.output:
         out_path = Path(args.output)
@@ -113,9 +139,22 @@ def main() -> int:
     else:
         out_path = next_version_path(summaries_path)
 
+    # Filter summaries, writing kept sections as they are found.  The input
+    # is fully read first, so --overwrite can safely reopen the same path.
+    raw = summaries_path.read_bytes()
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(("\n" + SECTION_SEP + "\n").join(kept) + "\n", encoding="utf-8")
-    print(f"Removed {removed} outliers ({len(kept)} remaining). Written to {out_path}")
+    kept = removed = 0
+    with out_path.open("wb") as out:
+        for section in iter_sections(raw):
+            if extract_id_from_section(section) in outlier_ids:
+                removed += 1
+                continue
+            if kept:
+                out.write(SECTION_SEP_BYTES)
+            out.write(section)
+            kept += 1
+        out.write(b"\n")
+    print(f"Removed {removed} outliers ({kept} remaining). Written to {out_path}")
     return 0
 
 
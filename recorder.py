@@ -13,13 +13,18 @@ Usage:
     Press 'q' then Enter to stop recording.
 """
 
+import functools
+import re
 import subprocess
 import sys
 import shutil
 
+_DIM_RE = re.compile(r"dimensions:\s+(\d+x\d+)")  # e.g. "1920x1080"
 
+
+@functools.lru_cache(maxsize=1)
 def _pactl_info() -> dict[str, str]:
-    """Parse 'pactl info' into a dict."""
+    """Parse 'pactl info' into a dict (run once per process)."""
     result = subprocess.run(
         ["pactl", "info"],
         capture_output=True, text=True, check=True,
@@ -48,10 +53,8 @@ def get_screen_size() -> str:
         ["xdpyinfo"],
         capture_output=True, text=True,
     )
-    for line in result.stdout.splitlines():
-        if "dimensions:" in line:
-            return line.split()[1].split("+")[0]  # e.g. "1920x1080"
-    return "1920x1080"
+    m = _DIM_RE.search(result.stdout)
+    return m.group(1) if m else "1920x1080"
 
 
 def is_wayland() -> bool:
@@ -59,6 +62,12 @@ def is_wayland() -> bool:
     return "WAYLAND_DISPLAY" in os.environ
 
 
+# Input options must precede each -i to take effect: skip input buffering
+# and the default multi-second stream probing
+INPUT_LOW_LATENCY = ["-rtbufsize", "100M", "-fflags", "nobuffer"]
+VIDEO_PROBE = ["-probesize", "32", "-analyzeduration", "0"]
+
+
 def build_command(output_file: str) -> list[str]:
     mic = get_default_mic()
     speaker = get_speaker_monitor()
@@ -71,7 +80,7 @@ def build_command(output_file: str) -> list[str]:
     # Video input
     if is_wayland():
         # PipeWire screen capture for Wayland
-        cmd += [
+        cmd += INPUT_LOW_LATENCY + VIDEO_PROBE + [
             "-f", "pipewire",
             "-framerate", "30",
             "-i", "default",
@@ -79,7 +88,7 @@ def build_command(output_file: str) -> list[str]:
     else:
         size = get_screen_size()
         print(f"Screen size: {size}")
-        cmd += [
+        cmd += INPUT_LOW_LATENCY + VIDEO_PROBE + [
             "-video_size", size,
             "-framerate", "30",
             "-f", "x11grab",
@@ -87,10 +96,8 @@ def build_command(output_file: str) -> list[str]:
         ]
 
     # Audio inputs
-    cmd += [
-        "-f", "pulse", "-i", mic,       # microphone
-        "-f", "pulse", "-i", speaker,    # speaker loopback
-    ]
+    cmd += INPUT_LOW_LATENCY + ["-f", "pulse", "-i", mic]        # microphone
+    cmd += INPUT_LOW_LATENCY + ["-f", "pulse", "-i", speaker]    # speaker loopback
 
     # Mix audio + encode
     cmd += [
@@ -98,6 +105,7 @@ def build_command(output_file: str) -> list[str]:
         "-map", "0:v",
         "-map", "[a]",
         "-c:v", "libx264", "-preset", "ultrafast", "-crf", "23",
+        "-tune", "zerolatency", "-x264opts", "no-scenecut",
         "-c:a", "aac", "-b:a", "192k",
         output_file,
     ]
@@ -8,44 +8,91 @@ Usage:
 """
 
 import argparse
+import io
+import mmap
+import os
 import re
+import string
 import sys
 from pathlib import Path
+from typing import Iterator
 
-URL_PATTERN = re.compile(r"https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+")
+SECTION_URL_RE = re.compile(r"\*\*URL:\*\*\s*(https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+)")
+SUMMARIES_VERSION_RE = re.compile(r"summaries_v([1-9]\d*)\.md")
 
 SECTION_SEP = "-" * 36
 
+# One pass over the summaries file finds both section separators, delimited
+# by \n, \r\n or \r, and each section's **URL:** metadata line
+SECTION_TOKEN_RE = re.compile(
+    rb"(?:\r\n?|\n)" + SECTION_SEP.encode() + rb"(?:\r\n?|\n)|" + SECTION_URL_RE.pattern.encode()
+)
+
+_SLUG_ALLOWED = set(string.ascii_letters + string.digits)
+_SLUG_TABLE = str.maketrans({chr(c): "_" for c in range(128) if chr(c) not in _SLUG_ALLOWED})
+
 SEP = r"\s*[-\u2014\u2013]{1,3}\s*"
+# Categories never contain an em/en dash, so the category group cannot
+# backtrack past the separator that ends it
 CATEGORIZATION_PATTERN = re.compile(
-    r"\*\*(.+?)\*\*" + SEP + r"(.+?)" + SEP + r".+?" + SEP +
+    r"\*\*(.+?)\*\*" + SEP + r"([^\u2014\u2013\n]+?)" + SEP + r".+?" + SEP +
     r"(https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+)"
 )
 
 
 def find_latest_summaries(input_dir: Path) -> Path:
-    """Find the highest-versioned summaries file, falling back to summaries.md."""
-    base = input_dir / "summaries.md"
-    latest = base
-    version = 2
-    while (candidate := input_dir / f"summaries_v{version}.md").exists():
-        latest = candidate
-        version += 1
-    if not latest.exists():
-        return base  # let caller handle the missing-file error
-    return latest
+    """Find the highest-versioned summaries file, falling back to summaries.md.
 
+    The directory is listed once rather than probing each version in turn.
+    """
+    latest = input_dir / "summaries.md"  # caller handles a missing file
+    version = 1
+    try:
+        with os.scandir(input_dir) as it:
+            for entry in it:
+                m = SUMMARIES_VERSION_RE.fullmatch(entry.name)
+                if m and int(m.group(1)) > version and entry.is_file():
+                    version = int(m.group(1))
+                    latest = Path(entry.path)
+    except OSError:
+        pass
+    return latest
 
-def parse_sections(text: str) -> list[str]:
-    """Split summaries.md on section separator, dropping empty sections."""
-    parts = text.split("\n" + SECTION_SEP + "\n")
-    return [s.strip() for s in parts if s.strip()]
 
+def iter_sections(path: Path) -> Iterator[tuple[str, str | None]]:
+    """Yield (section, url) for each non-empty section of a summaries file.
 
-def extract_url_from_section(section: str) -> str | None:
-    """Extract the URL from a section's **URL:** metadata line."""
-    m = re.search(r"\*\*URL:\*\*\s*(https://www\.youtube\.com/watch\?v=[A-Za-z0-9_-]+)", section)
-    return m.group(1) if m else None
+    url is taken from the section's first **URL:** metadata line, or None.
+    The file is memory-mapped and scanned at the byte level; only each
+    section's slice is decoded, right before it is yielded, with its
+    newlines normalised to "\\n" as a text-mode read would.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            url = None
+            for m in SECTION_TOKEN_RE.finditer(mm):
+                if m.group(1):
+                    if url is None:
+                        url = m.group(1).decode("ascii")
+                    continue
+                section = decode_section(mm[start:m.start()])
+                if section:
+                    yield section, url
+                start = m.end()
+                url = None
+            section = decode_section(mm[start:])
+            if section:
+                yield section, url
+
+
+def decode_section(raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.strip()
 
 
 def slugify_category(name: str) -> str:
@@ -53,10 +100,10 @@ def slugify_category(name: str) -> str:
 
     "Resume & Applications" -> "resume_and_applications"
     """
-    s = name.replace("&", "and")
-    s = re.sub(r"[^a-zA-Z0-9]+", "_", s)
-    s = s.strip("_").lower()
-    return s
+    # Non-ASCII characters become "?" so the ASCII table maps them to "_"
+    s = name.replace("&", "and").encode("ascii", "replace").decode("ascii")
+    s = s.translate(_SLUG_TABLE)
+    return "_".join(filter(None, s.split("_"))).lower()
 
 
 def parse_categorizations(analysis_text: str) -> dict[str, str]:
@@ -99,19 +146,23 @@ def main() -> int:
         print("No categorization lines found in analysis file. Nothing to split.")
         return 1
 
-    # Parse summaries into sections
-    text = summaries_path.read_text(encoding="utf-8")
-    sections = parse_sections(text)
-
-    # Group sections by category
-    categories: dict[str, list[str]] = {}
+    # Group sections by category, writing each straight into its category's
+    # output buffer
+    categories: dict[str, io.StringIO] = {}
+    counts: dict[str, int] = {}
     summary_urls = set()
-    for section in sections:
-        url = extract_url_from_section(section)
+    for section, url in iter_sections(summaries_path):
         if url:
             summary_urls.add(url)
         category = url_to_category.get(url, "Uncategorized") if url else "Uncategorized"
-        categories.setdefault(category, []).append(section)
+        buf = categories.get(category)
+        if buf is None:
+            buf = categories[category] = io.StringIO()
+            counts[category] = 0
+        else:
+            buf.write("\n" + SECTION_SEP + "\n")
+        buf.write(section)
+        counts[category] += 1
 
     # Write category files
     out_dir = Path(args.output_dir) if args.output_dir else input_dir / "categories"
@@ -119,12 +170,13 @@ def main() -> int:
 
     print(f"\n{'Category':<30} {'File':<40} {'Count':>5}")
     print("-" * 77)
-    for category, cat_sections in sorted(categories.items()):
+    for category, buf in sorted(categories.items()):
         slug = slugify_category(category)
         filename = f"{slug}.md"
         out_path = out_dir / filename
-        out_path.write_text(("\n" + SECTION_SEP + "\n").join(cat_sections) + "\n", encoding="utf-8")
-        print(f"{category:<30} {filename:<40} {len(cat_sections):>5}")
+        buf.write("\n")
+        out_path.write_text(buf.getvalue(), encoding="utf-8")
+        print(f"{category:<30} {filename:<40} {counts[category]:>5}")
 
     print(f"\nWrote {len(categories)} category files to {out_dir}/")
 
@@ -6,24 +6,35 @@ AssemblyAI for transcription and Anthropic's Claude for enhancement.
 Requirements:
 - AssemblyAI API key (https://www.assemblyai.com/)
 - Anthropic API key (https://console.anthropic.com/)
-- Python packages: assemblyai, anthropic, pydub
+- Python packages: assemblyai, anthropic
 
 Usage:
 python transcribe.py input.mp3 output.md
 """
 
 import argparse
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
 import os
 from typing import List
 import assemblyai as aai
 import anthropic
-from pydub import AudioSegment
+import httpx
 import asyncio
 import io
 
 
+# English transcripts average about four characters per token.  Chunks are
+# sized in estimated tokens, and the enhancement output budget leaves room
+# for a full chunk to come back while staying under the SDK's limit for
+# non-streaming requests.
+CHARS_PER_TOKEN = 4
+CHUNK_TOKENS = 12000
+ENHANCE_MAX_TOKENS = 16000
+
+
 @dataclass
 class Utterance:
     """A single utterance from a speaker"""
@@ -51,9 +62,20 @@ class Transcriber:
     def transcribe(self, audio_path: Path) -> List[Utterance]:
         """Get transcript from AssemblyAI"""
         print("Getting transcript from AssemblyAI...")
+        return self.await_result(self.submit(audio_path))
+
+    def submit(self, audio_path: Path) -> str:
+        """Upload *audio_path* and queue a transcription job; return its id"""
         config = aai.TranscriptionConfig(speaker_labels=True, language_code="en", speech_models=["universal-3-pro"])
-        transcript = aai.Transcriber().transcribe(str(audio_path), config=config)
-        
+        transcript = aai.Transcriber().submit(str(audio_path), config=config)
+        return transcript.id
+
+    def await_result(self, job_id: str) -> List[Utterance]:
+        """Poll a submitted job until it finishes and return its utterances"""
+        transcript = aai.Transcript.get_by_id(job_id).wait_for_completion()
+        if transcript.status == aai.TranscriptStatus.error:
+            raise RuntimeError(f"AssemblyAI job {job_id} failed: {transcript.error}")
+
         return [
             Utterance(speaker=u.speaker, text=u.text, start=u.start, end=u.end)
             for u in transcript.utterances
@@ -105,21 +127,30 @@ When we showed it to the client last week, they were completely blown away by wh
 
     USER_PROMPT = "Enhance the following transcript, starting directly with the speaker format:\n\n"
 
-    def __init__(self, api_key: str, model: str):
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+    def __init__(self, api_key: str, model: str, concurrency: int = 5):
+        # Keep enough warm connections for every concurrent chunk
+        http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=concurrency * 2,
+                max_connections=concurrency * 4,
+            ),
+        )
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
         self.model = model
+        self.concurrency = concurrency
+        # Shared by every enhance_chunks call, so concurrent transcripts
+        # together stay within *concurrency* in-flight requests
+        self.semaphore = asyncio.Semaphore(concurrency)
 
     async def enhance_chunks(self, chunks: List[str]) -> List[str]:
         """Enhance multiple transcript chunks concurrently"""
         print(f"Enhancing {len(chunks)} chunks with {self.model}...")
-        
-        semaphore = asyncio.Semaphore(5)
-        
+
         async def process_chunk(i: int, text: str) -> str:
-            async with semaphore:
+            async with self.semaphore:
                 response = await self.client.messages.create(
                     model=self.model,
-                    max_tokens=8192,
+                    max_tokens=ENHANCE_MAX_TOKENS,
                     system=self.SYSTEM_PROMPT,
                     messages=[
                         {"role": "user", "content": self.USER_PROMPT + text}
@@ -134,43 +165,40 @@ When we showed it to the client last week, they were completely blown away by wh
 
 
 def format_chunk(utterances: List[Utterance]) -> str:
-    """Format utterances into readable text with timestamps"""
-    sections = []
+    """Format utterances into readable text with timestamps
+
+    Each speaker run is headed by the timestamp of its first utterance.
+    """
+    out = io.StringIO()
     current_speaker = None
-    current_texts = []
-    
-    for u in utterances:
-        if current_speaker != u.speaker:
-            if current_texts:
-                sections.append(f"Speaker {current_speaker} {utterances[len(sections)].timestamp}\n\n{''.join(current_texts)}")
+
+    for i, u in enumerate(utterances):
+        if i == 0 or current_speaker != u.speaker:
+            if i:
+                out.write("\n\n")
+            out.write(f"Speaker {u.speaker} {u.timestamp}\n\n")
             current_speaker = u.speaker
-            current_texts = []
-        current_texts.append(u.text)
-    
-    if current_texts:
-        sections.append(f"Speaker {current_speaker} {utterances[len(sections)].timestamp}\n\n{''.join(current_texts)}")
-    
-    return "\n\n".join(sections)
+        out.write(u.text)
+
+    return out.getvalue()
 
 
-def chunk_utterances(utterances: List[Utterance], max_tokens: int = 8000) -> List[List[Utterance]]:
-    """Split utterances into chunks by approximate token count"""
+def chunk_utterances(utterances: List[Utterance], max_tokens: int = CHUNK_TOKENS) -> List[List[Utterance]]:
+    """Split utterances into chunks by approximate token count
+
+    Tokens are estimated as CHARS_PER_TOKEN characters each.  Chunk
+    boundaries are found by bisecting a prefix sum of text lengths; every
+    chunk holds at least one utterance.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    cum = list(accumulate(len(u.text) for u in utterances))
     chunks = []
-    current = []
-    text_length = 0
-    
-    for u in utterances:
-        new_length = text_length + len(u.text)
-        if current and new_length > max_tokens:
-            chunks.append(current)
-            current = [u]
-            text_length = len(u.text)
-        else:
-            current.append(u)
-            text_length = new_length
-            
-    if current:
-        chunks.append(current)
+    start = 0
+    while start < len(utterances):
+        base = cum[start - 1] if start else 0
+        end = max(bisect_right(cum, base + max_chars, lo=start), start + 1)
+        chunks.append(utterances[start:end])
+        start = end
     return chunks
 
 
@@ -189,6 +217,8 @@ def main():
     parser.add_argument("--anthropic-key", help="Anthropic API key (can also use ANTHROPIC_API_KEY env var)")
     parser.add_argument("--model", help="Anthropic model (can also use ANTHROPIC_MODEL env var)",
                         default=None)
+    parser.add_argument("--concurrency", type=int, default=5,
+                        help="Max parallel enhancement calls (default: 5)")
     args = parser.parse_args()
     
     audio_path = Path(args.audio_file)
@@ -216,7 +246,7 @@ def main():
         utterances = transcriber.transcribe(audio_path)
         
         # Enhance transcript
-        enhancer = Enhancer(anthropic_key, model)
+        enhancer = Enhancer(anthropic_key, model, args.concurrency)
         chunks = prepare_text_chunks(utterances)
         enhanced = asyncio.run(enhancer.enhance_chunks(chunks))
         
@@ -4,27 +4,42 @@
 import sys
 import os
 import re
+import json
+import time
 import argparse
+import functools
+import operator
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.parse import quote
 from youtube_transcript_api import YouTubeTranscriptApi
 
+DEFAULT_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "yttranscribe"
+DEFAULT_CACHE_TTL_HOURS = 24
+
+# A video ID inside a URL, or a bare ID on its own
+_VIDEO_ID_RE = re.compile(r"(?:v=|/v/|youtu\.be/|/embed/)([a-zA-Z0-9_-]{11})|^([a-zA-Z0-9_-]{11})$")
+
 
 def extract_video_id(url_or_id: str) -> str:
     """Extract video ID from a YouTube URL or return as-is if already an ID."""
-    patterns = [
-        r"(?:v=|/v/|youtu\.be/|/embed/)([a-zA-Z0-9_-]{11})",
-        r"^([a-zA-Z0-9_-]{11})$",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url_or_id)
-        if match:
-            return match.group(1)
+    match = _VIDEO_ID_RE.search(url_or_id)
+    if match:
+        return match.group(1) or match.group(2)
     raise ValueError(f"Could not extract video ID from: {url_or_id}")
 
 
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to HH:MM:SS or MM:SS format."""
-    h, remainder = divmod(int(seconds), 3600)
+    return _format_whole_seconds(int(seconds))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    """Format whole seconds; consecutive caption lines often share a value."""
+    h, remainder = divmod(seconds, 3600)
     m, s = divmod(remainder, 60)
     if h > 0:
         return f"{h:02d}:{m:02d}:{s:02d}"
@@ -45,6 +60,29 @@ def download_transcript(video_id: str, lang: str = "en", proxy_config=None) -> l
     return transcript.fetch()
 
 
+def cache_path_for(cache_dir: Path, video_id: str) -> Path:
+    return cache_dir / f"{video_id}.json"
+
+
+def load_cached_lines(cache_dir: Path, video_id: str, ttl_seconds: float) -> list[tuple[str, float]] | None:
+    """Return cached (cleaned_text, start) lines for a video, or None if stale or missing."""
+    path = cache_path_for(cache_dir, video_id)
+    try:
+        if time.time() - path.stat().st_mtime > ttl_seconds:
+            return None
+        return [(text, start) for text, start in json.loads(path.read_bytes())]
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_cached_lines(cache_dir: Path, video_id: str, lines: list[tuple[str, float]]) -> None:
+    path = cache_path_for(cache_dir, video_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(lines, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(path)
+
+
 def build_proxy_config(webshare_user: str | None, webshare_pass: str | None):
     """Build a proxy config for standalone transcript fetches."""
     if webshare_pass and os.getenv("WEBSHARE_PROXY_USERS"):
@@ -72,54 +110,105 @@ def build_proxy_config(webshare_user: str | None, webshare_pass: str | None):
 
 def clean_text(text: str) -> str:
     """Clean extraneous characters from transcript text."""
-    text = text.replace("\xa0", " ")
-    text = re.sub(r" {2,}", " ", text)
-    return text.strip()
+    # str.split() treats newlines, tabs and non-breaking spaces as whitespace
+    return " ".join(text.split())
 
 
-def deduplicate(entries) -> list:
-    """Remove consecutive duplicate lines, keeping the earliest timestamp."""
+_text_and_start = operator.attrgetter("text", "start")
+
+
+def iter_clean_lines(entries) -> Iterator[tuple[str, float]]:
+    """Clean each entry once and skip consecutive duplicate lines.
+
+    Yields (cleaned_text, start) tuples, keeping the earliest timestamp of
+    each run of duplicates.
+    """
     seen_text = None
-    deduped = []
-    for entry in entries:
-        text = clean_text(entry.text.replace("\n", " "))
+    prev_raw = None
+    for raw, start in map(_text_and_start, entries):
+        # Identical raw text cleans to the line just seen; skip the cleanup
+        if raw is prev_raw or raw == prev_raw:
+            continue
+        prev_raw = raw
+        text = clean_text(raw)
         if text != seen_text:
-            deduped.append(entry)
+            yield text, start
             seen_text = text
-    return deduped
 
 
-def entries_to_plain_text(entries) -> str:
-    """Convert transcript entries to plain text without timestamps."""
-    lines = []
-    for entry in entries:
-        text = clean_text(entry.text.replace("\n", " "))
-        if text:
-            lines.append(text)
-    return "\n".join(lines)
+def drop_overlapping(lines: Iterable[tuple[str, float]], window: int = 8,
+                     threshold: float = 0.8) -> Iterator[tuple[str, float]]:
+    """Skip lines whose word bigrams mostly repeat the last *window* lines.
+
+    Auto-generated captions often scroll the same words through several
+    segments (A, AB, BC, ...); consecutive-duplicate removal misses those.
+    Lines with fewer than two bigrams are always kept.
+    """
+    recent: deque[list[tuple[str, str]]] = deque()
+    counts: Counter[tuple[str, str]] = Counter()
+    for text, start in lines:
+        words = text.lower().split()
+        bigrams = list(zip(words, words[1:]))
+        if len(bigrams) >= 2:
+            seen = sum(1 for bg in bigrams if counts[bg])
+            if seen >= threshold * len(bigrams):
+                continue
+        yield text, start
+        recent.append(bigrams)
+        counts.update(bigrams)
+        if len(recent) > window:
+            counts.subtract(recent.popleft())
+
+
+def deduplicate(entries) -> list[tuple[str, float]]:
+    """Return the (cleaned_text, start) lines of iter_clean_lines as a list."""
+    return list(iter_clean_lines(entries))
+
+
+def entries_to_plain_text(lines: list[tuple[str, float]]) -> str:
+    """Convert deduplicated lines to plain text without timestamps."""
+    return "\n".join(text for text, _start in lines if text)
+
+
+def save_transcript(lines: Iterable[tuple[str, float]], output_path: str, video_id: str,
+                    timestamps: bool = True) -> list[tuple[str, float]]:
+    """Write (cleaned_text, start) lines to a markdown file in one write.
+
+    Returns the lines written, so callers streaming from iter_clean_lines
+    can reuse them without a second pass over the raw entries.
+    """
+    written = []
+    parts = [
+        "# Transcript\n\n",
+        f"**Source:** https://www.youtube.com/watch?v={video_id}\n\n---\n\n",
+    ]
+    if timestamps:
+        def emit(text: str, start: float) -> str:
+            return f"**[{format_timestamp(start)}]** {text}\n\n"
+    else:
+        def emit(text: str, start: float) -> str:
+            return f"{text}\n\n"
+
+    append_part = parts.append
+    for line in lines:
+        append_part(emit(*line))
+        written.append(line)
 
+    # One encode over the whole payload instead of the text layer per write
+    with open(output_path, "wb", buffering=1 << 20) as f:
+        f.write("".join(parts).encode("utf-8"))
+    return written
 
-def save_transcript(entries, output_path: str, video_id: str, timestamps: bool = True) -> None:
-    """Write transcript to a markdown file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(f"# Transcript\n\n")
-        f.write(f"**Source:** https://www.youtube.com/watch?v={video_id}\n\n---\n\n")
 
-        for entry in entries:
-            text = clean_text(entry.text.replace("\n", " "))
-            if timestamps:
-                ts = format_timestamp(entry.start)
-                f.write(f"**[{ts}]** {text}\n\n")
-            else:
-                f.write(f"{text}\n\n")
+_TEXT_DELTA_EVENTS = frozenset(("response.output_text.delta", "response.refusal.delta"))
 
 
-def interactive_chat(entries, video_id: str) -> None:
+def interactive_chat(lines: list[tuple[str, float]], video_id: str) -> None:
     """Start an interactive chat session about the transcript using OpenAI ChatGPT 5.2."""
     from openai import OpenAI
 
     client = OpenAI()
-    transcript_text = entries_to_plain_text(entries)
+    transcript_text = entries_to_plain_text(lines)
 
     # ChatGPT-aligned model alias
     model = "gpt-5.2-chat-latest"  # :contentReference[oaicite:2]{index=2}
@@ -146,7 +235,12 @@ def interactive_chat(entries, video_id: str) -> None:
     print("  Type 'quit' or 'exit' to end the session.")
     print("=" * 60 + "\n")
 
-    first_turn = True
+    # Built once; sent as its own input item ahead of the first question so
+    # later turns reach it through previous_response_id
+    transcript_message = {
+        "role": "user",
+        "content": f"Here is the transcript of a YouTube video:\n\n<transcript>\n{transcript_text}\n</transcript>",
+    }
 
     while True:
         try:
@@ -161,16 +255,12 @@ def interactive_chat(entries, video_id: str) -> None:
             print("Goodbye!")
             break
 
-        # Prepend the transcript to the first user message only
-        if first_turn:
-            content = (
-                f"Here is the transcript of a YouTube video:\n\n"
-                f"<transcript>\n{transcript_text}\n</transcript>\n\n"
-                f"{user_input}"
-            )
-            first_turn = False
+        # Include the transcript until a response has stored it server-side
+        question = {"role": "user", "content": user_input}
+        if previous_response_id is None:
+            turn_input = [transcript_message, question]
         else:
-            content = user_input
+            turn_input = [question]
 
         try:
             # Stream the response (semantic streaming events). :contentReference[oaicite:4]{index=4}
@@ -179,7 +269,7 @@ def interactive_chat(entries, video_id: str) -> None:
             req = dict(
                 model=model,
                 instructions=system_prompt,
-                input=[{"role": "user", "content": content}],
+                input=turn_input,
                 stream=True,
             )
 
@@ -193,20 +283,17 @@ def interactive_chat(entries, video_id: str) -> None:
 
             stream = client.responses.create(**req)
 
-            full_response = ""
+            # Bound once: deltas arrive per token, too often for print()
+            write = sys.stdout.write
+            flush = sys.stdout.flush
             for event in stream:
-                etype = getattr(event, "type", None)
-
-                if etype == "response.output_text.delta":
-                    delta = event.delta
-                    print(delta, end="", flush=True)
-                    full_response += delta
+                etype = event.type
 
-                elif etype == "response.refusal.delta":
-                    # If the model refuses, stream the refusal text.
+                # Output text and, if the model refuses, the refusal text
+                if etype in _TEXT_DELTA_EVENTS:
                     delta = event.delta
-                    print(delta, end="", flush=True)
-                    full_response += delta
+                    write(delta)
+                    flush()
 
                 elif etype == "response.completed":
                     # Save conversation state for the next turn.
@@ -228,6 +315,12 @@ def main():
     parser.add_argument("output", nargs="?", default="transcript.md", help="Output file (default: transcript.md)")
     parser.add_argument("--no-timestamps", action="store_true", help="Omit timestamps from output")
     parser.add_argument("--chat", action="store_true", help="Start an interactive AI chat about the transcript")
+    parser.add_argument("--dedupe-overlap", action="store_true",
+                        help="Also drop lines that mostly repeat recent lines (scrolling auto-captions)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Always fetch captions instead of reusing cleaned ones from {DEFAULT_CACHE_DIR}")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL_HOURS,
+                        help=f"Hours cached captions stay valid (default: {DEFAULT_CACHE_TTL_HOURS})")
     parser.add_argument("--webshare-user", help="Webshare proxy username (or WEBSHARE_PROXY_USER env)")
     parser.add_argument("--webshare-pass", help="Webshare proxy password (or WEBSHARE_PROXY_PASS env)")
     args = parser.parse_args()
@@ -238,16 +331,32 @@ def main():
     proxy_config = build_proxy_config(ws_user, ws_pass)
 
     video_id = extract_video_id(args.url)
-    print(f"Fetching transcript for video: {video_id}")
-
-    entries = download_transcript(video_id, proxy_config=proxy_config)
-    entries = deduplicate(entries)
-    save_transcript(entries, args.output, video_id, timestamps=not args.no_timestamps)
-
-    print(f"Saved {len(entries)} entries to {args.output}")
-
-    if args.chat:
-        interactive_chat(entries, video_id)
+    lines = None if args.no_cache else load_cached_lines(DEFAULT_CACHE_DIR, video_id, args.cache_ttl * 3600)
+    if lines is not None:
+        print(f"Using cached transcript for video: {video_id}")
+    else:
+        print(f"Fetching transcript for video: {video_id}")
+        entries = download_transcript(video_id, proxy_config=proxy_config)
+        # Clean and dedupe in one pass over the fetched entries
+        lines = deduplicate(entries)
+        save_cached_lines(DEFAULT_CACHE_DIR, video_id, lines)
+
+    if args.dedupe_overlap:
+        lines = drop_overlapping(lines)
+    timestamps = not args.no_timestamps
+
+    if not args.chat:
+        lines = save_transcript(lines, args.output, video_id, timestamps=timestamps)
+        print(f"Saved {len(lines)} entries to {args.output}")
+        return
+
+    # Write the file in the background so the chat client starts right away
+    lines = list(lines)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        saved = pool.submit(save_transcript, lines, args.output, video_id, timestamps)
+        interactive_chat(lines, video_id)
+        saved.result()
+    print(f"Saved {len(lines)} entries to {args.output}")
 
 
 if __name__ == "__main__":